@@ -0,0 +1,49 @@
+"""
+Compares the memory held by `prepare(_quantity=count)` instances with that
+of `prepare_records` records, and the time to turn records into instances.
+
+    python benchmarks/records.py [count]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    INSTALLED_APPS=['django.contrib.contenttypes', 'tests.generic'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+)
+django.setup()
+
+from model_mommy import mommy  # noqa: E402
+from model_mommy.records import to_instances  # noqa: E402
+from tests.generic import models  # noqa: E402
+
+
+def held(function):
+    tracemalloc.start()
+    try:
+        objects = function()
+        return tracemalloc.get_traced_memory()[0], objects
+    finally:
+        tracemalloc.stop()
+
+
+def main(count=100000):
+    for model in (models.DummyNumbersModel, models.Person):
+        mommy.prepare_records(model, 1)  # build the record class
+        instances_size, _ = held(lambda: mommy.prepare(model, _quantity=count))
+        records_size, records = held(lambda: mommy.prepare_records(model, count))
+        seconds = timeit.timeit(lambda: to_instances(records), number=1)
+        print('%s: prepare %d bytes per object, prepare_records %d, to_instances %.3fs' % (
+            model.__name__, instances_size // count, records_size // count, seconds
+        ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
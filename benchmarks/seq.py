@@ -0,0 +1,36 @@
+"""
+Benchmarks `seq` for the kinds of values it supports.
+
+    python benchmarks/seq.py [count]
+"""
+import datetime
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings  # noqa: E402
+
+settings.configure(USE_TZ=True)
+
+from model_mommy.utils import seq  # noqa: E402
+
+SEQUENCES = [
+    ('int', lambda: seq(10)),
+    ('Decimal', lambda: seq(Decimal('10.1'), increment_by=Decimal('0.1'))),
+    ('date', lambda: seq(datetime.date(2020, 1, 1), datetime.timedelta(days=1))),
+    ('datetime', lambda: seq(datetime.datetime(2020, 1, 1), datetime.timedelta(hours=1))),
+]
+
+
+def main(count=100000):
+    for name, sequence in SEQUENCES:
+        loop = timeit.timeit(lambda: [v for _, v in zip(range(count), sequence())], number=5)
+        take = timeit.timeit(lambda: sequence().take(count), number=5)
+        print('%-10s next(): %.3fs  take(%d): %.3fs' % (name, loop / 5, count, take / 5))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -24,3 +24,7 @@ class CustomMommyNotFound(Exception):
 
 class InvalidCustomMommy(Exception):
     pass
+
+
+class UniqueValuesExhausted(Exception):
+    pass
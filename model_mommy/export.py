@@ -0,0 +1,218 @@
+"""
+Writes generated rows of a model straight to columnar files.
+
+Parquet files need pyarrow and NumPy `.npz` files need numpy; CSV files
+need neither.
+"""
+import csv
+import os
+from itertools import islice
+
+from django.db.models import ForeignKey
+from django.utils.timezone import utc
+
+from . import mommy
+from .timezone import use_tz
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ('parquet', 'npz', 'csv')
+DEFAULT_CHUNK_SIZE = 10000
+
+__all__ = ['export_rows', 'FORMATS']
+
+# Django internal type -> pyarrow type and numpy dtype of integer fields.
+# Fields without a matching type are written as strings.
+_INTEGERS = {
+    'SmallIntegerField': 'int16',
+    'PositiveSmallIntegerField': 'int32',
+    'IntegerField': 'int32',
+    'PositiveIntegerField': 'int64',
+    'BigIntegerField': 'int64',
+    'AutoField': 'int32',
+    'BigAutoField': 'int64',
+}
+
+
+def _column_field(field):
+    # foreign keys are written as the value of the field they point to
+    while isinstance(field, ForeignKey):
+        field = field.target_field
+    return field
+
+
+def _arrow_type(field):
+    field = _column_field(field)
+    internal_type = field.get_internal_type()
+    if internal_type in _INTEGERS:
+        return getattr(pyarrow, _INTEGERS[internal_type])()
+    if internal_type == 'FloatField':
+        return pyarrow.float64()
+    if internal_type == 'DecimalField':
+        return pyarrow.decimal128(field.max_digits, field.decimal_places)
+    if internal_type in ('BooleanField', 'NullBooleanField'):
+        return pyarrow.bool_()
+    if internal_type == 'DateField':
+        return pyarrow.date32()
+    if internal_type == 'DateTimeField':
+        return pyarrow.timestamp('us', tz='UTC' if use_tz() else None)
+    if internal_type == 'TimeField':
+        return pyarrow.time64('us')
+    if internal_type == 'DurationField':
+        return pyarrow.duration('us')
+    if internal_type == 'BinaryField':
+        return pyarrow.binary()
+    return pyarrow.string()
+
+
+def _numpy_dtype(field):
+    field = _column_field(field)
+    internal_type = field.get_internal_type()
+    if internal_type in _INTEGERS:
+        return _INTEGERS[internal_type]
+    if internal_type == 'FloatField':
+        return 'float64'
+    if internal_type == 'BooleanField':
+        return 'bool'
+    if internal_type == 'DateField':
+        return 'datetime64[D]'
+    if internal_type == 'DateTimeField':
+        return 'datetime64[us]'
+    if internal_type == 'DurationField':
+        return 'timedelta64[us]'
+    if internal_type == 'BinaryField':
+        return 'bytes'
+    return 'str'
+
+
+def _converter(field, format):
+    """
+    Returns a function turning generated values of `field` into values the
+    writer of `format` accepts, or None when they can be used as they are.
+    """
+    internal_type = _column_field(field).get_internal_type()
+    if format == 'parquet':
+        if internal_type == 'BinaryField':
+            return _skip_none(bytes)
+        if _arrow_type(field) == pyarrow.string():
+            return _skip_none(str)
+    elif format == 'npz':
+        if internal_type == 'BinaryField':
+            return _skip_none(bytes)
+        if internal_type == 'DateTimeField':
+            # numpy datetimes are naive
+            return _skip_none(_naive_utc)
+        if _numpy_dtype(field) == 'str':
+            return _skip_none(str)
+    elif internal_type == 'BinaryField':
+        return _skip_none(lambda value: bytes(value).hex())
+    return None
+
+
+def _skip_none(convert):
+    return lambda value: None if value is None else convert(value)
+
+
+def _naive_utc(value):
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(utc).replace(tzinfo=None)
+
+
+def _guess_format(path):
+    extension = os.path.splitext(str(path))[1].lstrip('.').lower()
+    if extension in FORMATS:
+        return extension
+    if pyarrow is not None:
+        return 'parquet'
+    if numpy is not None:
+        return 'npz'
+    return 'csv'
+
+
+def _chunks(fields, rows, chunk_size, format):
+    converters = [_converter(field, format) for field in fields]
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        data = []
+        for converter, values in zip(converters, zip(*chunk)):
+            data.append([converter(v) for v in values] if converter else list(values))
+        yield data
+
+
+def export_rows(_model, path, _quantity, _format=None, _chunk_size=DEFAULT_CHUNK_SIZE, **attrs):
+    """
+    Generates `_quantity` rows of `_model` with `mommy.generate_rows` and
+    writes them to `path`, `_chunk_size` rows at a time.
+
+    `_format` is one of 'parquet', 'npz' or 'csv'. By default it is taken
+    from the extension of `path`, falling back to the first format whose
+    library is installed. Column types follow the model field types.
+    """
+    format = _format or _guess_format(path)
+    if format not in FORMATS:
+        raise ValueError('Unknown format %r, use one of %s.' % (format, ', '.join(FORMATS)))
+    if format == 'parquet' and pyarrow is None:
+        raise ImportError('pyarrow is required to write parquet files.')
+    if format == 'npz' and numpy is None:
+        raise ImportError('numpy is required to write npz files.')
+
+    rows = mommy.generate_rows(_model, _quantity, **attrs)
+    chunks = _chunks(rows.fields, rows, _chunk_size, format)
+    _writers[format](path, rows.columns, rows.fields, chunks)
+    return path
+
+
+def _write_parquet(path, columns, fields, chunks):
+    schema = pyarrow.schema([
+        pyarrow.field(column, _arrow_type(field))
+        for column, field in zip(columns, fields)
+    ])
+    with pyarrow.parquet.ParquetWriter(str(path), schema) as writer:
+        for data in chunks:
+            arrays = [
+                pyarrow.array(values, type=schema_field.type)
+                for values, schema_field in zip(data, schema)
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+
+
+def _write_npz(path, columns, fields, chunks):
+    parts = [[] for _ in columns]
+    for data in chunks:
+        for part, values, field in zip(parts, data, fields):
+            dtype = _numpy_dtype(field)
+            if not dtype.startswith(('datetime64', 'timedelta64')) and None in values:
+                # only numpy dates and times have a missing value
+                dtype = object
+            part.append(numpy.array(values, dtype=dtype))
+    arrays = dict(
+        (column, numpy.concatenate(part)) for column, part in zip(columns, parts)
+    )
+    numpy.savez_compressed(str(path), **arrays)
+
+
+def _write_csv(path, columns, fields, chunks):
+    with open(str(path), 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        for data in chunks:
+            writer.writerows(zip(*data))
+
+
+_writers = {
+    'parquet': _write_parquet,
+    'npz': _write_npz,
+    'csv': _write_csv,
+}
@@ -45,8 +45,8 @@ default_mapping = {
     BigIntegerField: random_gen.gen_integer,
     SmallIntegerField: random_gen.gen_integer,
 
-    PositiveIntegerField: lambda: random_gen.gen_integer(min_int=0),
-    PositiveSmallIntegerField: lambda: random_gen.gen_integer(min_int=0),
+    PositiveIntegerField: random_gen.gen_positive_integer,
+    PositiveSmallIntegerField: random_gen.gen_positive_integer,
 
     FloatField: random_gen.gen_float,
     DecimalField: random_gen.gen_decimal,
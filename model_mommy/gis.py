@@ -1,11 +1,107 @@
 from __future__ import absolute_import
+from random import uniform
+
 from django.apps import apps
+from django.conf import settings
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 MOMMY_GIS = apps.is_installed("django.contrib.gis")
 
+# (xmin, ymin, xmax, ymax) of the generated coordinates, unless
+# overridden by the MOMMY_GIS_BBOX setting.
+DEFAULT_BBOX = (0, 0, 1, 1)
+
 default_gis_mapping = {}
+geos_gis_mapping = {}
+
+__all__ = ['MOMMY_GIS', 'default_gis_mapping', 'geos_gis_mapping']
+
+
+def gen_coordinates(count, bbox=None):
+    """
+    Returns `count` random (x, y) tuples inside `bbox`, using NumPy to draw
+    them all at once when it is installed.
+    """
+    if bbox is None:
+        bbox = getattr(settings, 'MOMMY_GIS_BBOX', DEFAULT_BBOX)
+    xmin, ymin, xmax, ymax = bbox
+    if numpy is not None:
+        coords = numpy.random.uniform((xmin, ymin), (xmax, ymax), size=(count, 2))
+        return [tuple(c) for c in coords.tolist()]
+    return [(uniform(xmin, xmax), uniform(ymin, ymax)) for _ in range(count)]
+
+
+# geometry type -> (coordinates needed, builder), see _geometry_builders
+_builders = None
+
+
+def _geometry_builders():
+    """
+    Returns the geometry builders, importing GEOS on first use only, since
+    it needs the GEOS library.
+    """
+    global _builders
+    if _builders is not None:
+        return _builders
+
+    from django.contrib.gis.geos import (
+        GeometryCollection, LineString, MultiLineString, MultiPoint, MultiPolygon, Point,
+        Polygon,
+    )
+
+    def polygon(coords, **kwargs):
+        return Polygon(coords + [coords[0]], **kwargs)
+
+    # concurrent first calls build equal tables, so no lock is needed
+    _builders = {
+        'Geometry': (1, lambda c, srid: Point(c[0], srid=srid)),
+        'Point': (1, lambda c, srid: Point(c[0], srid=srid)),
+        'LineString': (2, lambda c, srid: LineString(c, srid=srid)),
+        'Polygon': (3, lambda c, srid: polygon(c, srid=srid)),
+        'MultiPoint': (1, lambda c, srid: MultiPoint(Point(c[0]), srid=srid)),
+        'MultiLineString': (2, lambda c, srid: MultiLineString(LineString(c), srid=srid)),
+        'MultiPolygon': (3, lambda c, srid: MultiPolygon(polygon(c), srid=srid)),
+        'GeometryCollection': (1, lambda c, srid: GeometryCollection(Point(c[0]), srid=srid)),
+    }
+    return _builders
+
+
+def gen_geometries(geom_type, count, srid=None, bbox=None):
+    """
+    Returns a list of `count` GEOS geometries of `geom_type` (e.g. 'Point',
+    'MultiPolygon'), drawing all their coordinates in one go.
+    """
+    size, build = _geometry_builders()[geom_type]
+    coords = gen_coordinates(count * size, bbox)
+    return [build(coords[i:i + size], srid) for i in range(0, len(coords), size)]
+
+
+def _srid(field):
+    # every field has an SRID (4326 by default), so the setting comes first
+    return 'srid', getattr(settings, 'MOMMY_GIS_SRID', field.srid)
+
+
+def _geos_generator(geom_type):
+    def generator(srid=None):
+        return gen_geometries(geom_type, 1, srid)[0]
+    generator.__name__ = 'gen_geos_%s' % geom_type.lower()
+    generator.required = [_srid]
+    return generator
+
+
+gen_geos_geometry = _geos_generator('Geometry')
+gen_geos_point = _geos_generator('Point')
+gen_geos_line_string = _geos_generator('LineString')
+gen_geos_polygon = _geos_generator('Polygon')
+gen_geos_multi_point = _geos_generator('MultiPoint')
+gen_geos_multi_line_string = _geos_generator('MultiLineString')
+gen_geos_multi_polygon = _geos_generator('MultiPolygon')
+gen_geos_geometry_collection = _geos_generator('GeometryCollection')
 
-__all__ = ['MOMMY_GIS', 'default_gis_mapping']
 
 if MOMMY_GIS:
     from . import random_gen
@@ -28,3 +124,13 @@ if MOMMY_GIS:
     default_gis_mapping[MultiLineStringField] = random_gen.gen_multi_line_string
     default_gis_mapping[MultiPolygonField] = random_gen.gen_multi_polygon
     default_gis_mapping[GeometryCollectionField] = random_gen.gen_geometry_collection
+
+    # used instead of default_gis_mapping when the MOMMY_GIS_GEOS setting is True
+    geos_gis_mapping[GeometryField] = gen_geos_geometry
+    geos_gis_mapping[PointField] = gen_geos_point
+    geos_gis_mapping[LineStringField] = gen_geos_line_string
+    geos_gis_mapping[PolygonField] = gen_geos_polygon
+    geos_gis_mapping[MultiPointField] = gen_geos_multi_point
+    geos_gis_mapping[MultiLineStringField] = gen_geos_multi_line_string
+    geos_gis_mapping[MultiPolygonField] = gen_geos_multi_polygon
+    geos_gis_mapping[GeometryCollectionField] = gen_geos_geometry_collection
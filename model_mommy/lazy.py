@@ -0,0 +1,125 @@
+"""
+Support for `prepare(..., _lazy=True)`.
+
+Lazy instances get their class swapped to an unregistered subclass of the
+model whose field descriptors generate the pending values on first access.
+Saving or pickling the instance generates every value left, and the model
+class is restored once no value is pending, e.g. after `bulk_create` read
+them all.
+"""
+import threading
+
+from django.db.models.base import ModelBase
+
+LAZY_FIELDS = '_mommy_lazy_fields'
+
+_lazy_classes = {}
+_lazy_classes_lock = threading.Lock()
+
+
+class LazyFieldDescriptor(object):
+    """
+    Wraps the descriptor of a model field attribute, generating the field
+    value first if it is still pending.
+    """
+
+    def __init__(self, field, attr, descriptor):
+        self.field = field
+        self.attr = attr
+        self.descriptor = descriptor
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self.descriptor
+        pending = instance.__dict__.get(LAZY_FIELDS)
+        if pending and self.field.name in pending:
+            generate(instance, self.field.name)
+        if self.descriptor is None:
+            return instance.__dict__[self.attr]
+        return self.descriptor.__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        pending = instance.__dict__.get(LAZY_FIELDS)
+        if pending:
+            pending.pop(self.field.name, None)
+        if hasattr(self.descriptor, '__set__'):
+            self.descriptor.__set__(instance, value)
+        else:
+            instance.__dict__[self.attr] = value
+        if pending is not None and not pending:
+            _restore_class(instance)
+
+
+def _lazy_save(self, *args, **kwargs):
+    materialize(self)
+    return self.save(*args, **kwargs)
+
+
+def _lazy_reduce(self):
+    # the pending values are closures, which can't be pickled
+    materialize(self)
+    return self.__reduce__()
+
+
+def lazy_class(model):
+    """
+    Returns the lazy subclass of `model`, building it on first use.
+    """
+    try:
+        return _lazy_classes[model]
+    except KeyError:
+        pass
+
+    attrs = {
+        '__module__': model.__module__,
+        '__qualname__': model.__qualname__,
+        'save': _lazy_save,
+        '__reduce__': _lazy_reduce,
+    }
+    for field in model._meta.concrete_fields:
+        for attr in set([field.name, field.attname]):
+            descriptor = getattr(model, attr, None)
+            attrs[attr] = LazyFieldDescriptor(field, attr, descriptor)
+
+    with _lazy_classes_lock:
+        if model not in _lazy_classes:
+            # type.__new__ skips ModelBase.__new__, so the subclass is not
+            # registered as a new model and shares the model's _meta.
+            _lazy_classes[model] = type.__new__(ModelBase, model.__name__, (model,), attrs)
+    return _lazy_classes[model]
+
+
+def make_lazy(instance, pending):
+    """
+    Turns `instance` into a lazy instance. `pending` maps field names to
+    callables returning the value of the field.
+    """
+    for name in pending:
+        field = instance._meta.get_field(name)
+        instance.__dict__.pop(field.attname, None)
+    instance.__dict__[LAZY_FIELDS] = dict(pending)
+    instance.__class__ = lazy_class(type(instance))
+    return instance
+
+
+def generate(instance, name):
+    value = instance.__dict__[LAZY_FIELDS][name]()
+    setattr(instance, name, value)
+
+
+def _restore_class(instance):
+    del instance.__dict__[LAZY_FIELDS]
+    instance.__class__ = type(instance).__bases__[0]
+
+
+def materialize(instance):
+    """
+    Generates all pending values of a lazy instance and gives it back its
+    model class. Other instances are left untouched.
+    """
+    pending = instance.__dict__.get(LAZY_FIELDS)
+    if pending is None:
+        return instance
+    for name in list(pending):
+        generate(instance, name)
+    return instance
@@ -1,3 +1,11 @@
+import asyncio
+import difflib
+import functools
+import importlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from os.path import dirname, join
 
 from django.conf import settings
@@ -5,7 +13,11 @@ from django.contrib.contenttypes.models import ContentType
 from django.apps import apps
 from django.contrib.contenttypes.fields import GenericRelation
 
-from django.db.models.base import ModelBase
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.core.signals import setting_changed
+from django.db.models.base import Model, ModelBase, ModelState
+from django.db.models.signals import class_prepared, post_save, pre_save
+from django.utils.module_loading import module_has_submodule
 from django.db.models import (
     ForeignKey, ManyToManyField, OneToOneField, Field, AutoField, BooleanField, FileField
 )
@@ -13,12 +25,12 @@ from django.db.models.fields.related import \
     ReverseManyToOneDescriptor as ForeignRelatedObjectsDescriptor
 from django.db.models.fields.proxy import OrderWrt
 
-from . import generators, random_gen
+from . import generators, gis, lazy, random_gen, records, scope, signals
 from .exceptions import (
     ModelNotFound, AmbiguousModelName, InvalidQuantityException, RecipeIteratorEmpty,
-    CustomMommyNotFound, InvalidCustomMommy
+    RecipeNotFound, CustomMommyNotFound, InvalidCustomMommy, UniqueValuesExhausted
 )
-from .utils import import_from_str, import_if_str
+from .utils import delete_cached_value, import_from_str, import_if_str
 
 recipes = None
 
@@ -28,59 +40,394 @@ mock_file_txt = join(dirname(__file__), 'mock_file.txt')
 
 MAX_MANY_QUANTITY = 5
 
+# Iterators given as attributes (e.g. `seq` in recipes) are shared between
+# calls and possibly between threads, and generators can't be advanced
+# concurrently.
+_iterator_lock = threading.RLock()
+
 
 def _valid_quantity(quantity):
     return quantity is not None and (not isinstance(quantity, int) or quantity < 1)
 
 
 def make(_model, _quantity=None, make_m2m=False, _save_kwargs=None, _refresh_after_create=False,
-         _create_files=False, **attrs):
+         _create_files=False, _using=None, _parallel=False, _signals=True, **attrs):
     """
     Creates a persisted instance from a given model its associated models.
     It fill the fields with random values or you can specify
     which fields you want to define its values by yourself.
+
+    `_using` takes a database alias, or a list of them, to write the
+    instances to. The instances, with their related objects, are made on
+    the first database and their rows, primary keys and m2m rows
+    included, are copied to the other ones (concurrently if `_parallel`
+    is set).
+
+    With `_signals=False` no pre_save, post_save or m2m_changed signal is
+    sent while the instances and their related instances are created.
     """
+    if not _signals:
+        with signals_disabled():
+            return make(
+                _model, _quantity=_quantity, make_m2m=make_m2m, _save_kwargs=_save_kwargs,
+                _refresh_after_create=_refresh_after_create, _create_files=_create_files,
+                _using=_using, _parallel=_parallel, **attrs
+            )
+
     _save_kwargs = _save_kwargs or {}
     mommy = Mommy.create(_model, make_m2m=make_m2m, create_files=_create_files)
     if _valid_quantity(_quantity):
         raise InvalidQuantityException
 
-    if _quantity:
-        return [
+    if _using is not None:
+        def make_first(save_kwargs):
+            return make(
+                _model, _quantity=_quantity, make_m2m=make_m2m, _save_kwargs=save_kwargs,
+                _refresh_after_create=_refresh_after_create, _create_files=_create_files,
+                **attrs
+            )
+        return _make_on_databases(_using, _parallel, _save_kwargs, make_first)
+
+    if not isinstance(mommy, Mommy):
+        # custom classes only have to provide make and prepare
+        instances = [
             mommy.make(
                 _save_kwargs=_save_kwargs,
                 _refresh_after_create=_refresh_after_create,
                 **attrs
             )
+            for _ in range(_quantity or 1)
+        ]
+        return instances if _quantity else instances[0]
+
+    # objects of reverse relations, e.g. from `dog_set__breed='pug'`, are
+    # created once all the instances exist
+    deferred_related = []
+    if _quantity:
+        # instances of a batch are read back with one query, not one each
+        from_manager = attrs.pop('_from_manager', None)
+        # attributes are sorted out once, not once per instance
+        classified = mommy.classify_attrs(attrs)
+        instances = [
+            mommy.make(
+                _save_kwargs=_save_kwargs, _deferred_related=deferred_related,
+                _classified=classified,
+            )
             for _ in range(_quantity)
         ]
-    return mommy.make(
+        _create_related(deferred_related)
+        if from_manager:
+            return _fetch_from_manager(mommy.model, instances, from_manager)
+        if _refresh_after_create:
+            _refresh_from_db(instances)
+        return instances
+    instance = mommy.make(
         _save_kwargs=_save_kwargs,
         _refresh_after_create=_refresh_after_create,
+        _deferred_related=deferred_related,
         **attrs
     )
+    _create_related(deferred_related)
+    return instance
 
 
-def prepare(_model, _quantity=None, _save_related=False, **attrs):
+def _create_related(deferred):
+    """
+    Creates the objects of reverse relations collected by `Mommy.make`,
+    `_quantity` of them (from e.g. `dog_set___quantity=3`) per instance,
+    with one bulk insert per relation when possible.
+    """
+    by_relation = OrderedDict()
+    for related, kwargs in deferred:
+        by_relation.setdefault(related, []).append(kwargs)
+
+    for related, attrs_list in by_relation.items():
+        model = related.field.model
+        if not _can_bulk_create(related.field, attrs_list):
+            for kwargs in attrs_list:
+                make(**kwargs)
+            continue
+
+        mommy = Mommy.create(model)
+        objs = []
+        for kwargs in attrs_list:
+            kwargs = dict(kwargs)
+            del kwargs['_model']
+            quantity = kwargs.pop('_quantity', None)
+            if _valid_quantity(quantity):
+                raise InvalidQuantityException
+            objs.extend(mommy.prepare(_save_related=True, **kwargs) for _ in range(quantity or 1))
+        db = attrs_list[0][related.field.name]._state.db
+        model._base_manager.using(db).bulk_create(objs)
+
+
+def _can_bulk_create(field, attrs_list):
+    """
+    Tells whether objects of the model of `field`, a foreign key to an
+    instance made before, can be created with `bulk_create` from
+    `attrs_list`, a list of attribute dicts or names, instead of `make`.
+    """
+    meta = field.model._meta
+    # bulk_create can't handle multi-table inheritance nor
+    # order_with_respect_to, and may not set primary keys: neither those of
+    # one-to-one objects cached on their parent nor those a recording
+    # fixture scope needs
+    if meta.parents or meta.order_with_respect_to or field.one_to_one or scope.recording():
+        return False
+    # nor does it call save() or send the save signals
+    model = field.model
+    if model.save is not Model.save:
+        return False
+    if not signals.muted() and (pre_save.has_listeners(model) or post_save.has_listeners(model)):
+        return False
+    # m2m values, reverse relations and make options need make
+    needs_make = set(f.name for f in meta.many_to_many)
+    needs_make.update(r.get_accessor_name() for r in meta.related_objects)
+    for kwargs in attrs_list:
+        for key in kwargs:
+            if key.startswith('_') and key not in ('_model', '_quantity', '_fill_optional'):
+                return False
+            if key.split('__', 1)[0] in needs_make:
+                return False
+    return True
+
+
+def _fetch_from_manager(model, instances, manager_name):
+    """
+    Returns `instances` as read through the `manager_name` manager of
+    `model`, e.g. to get its annotations, in the same order.
+    """
+    manager = getattr(model, manager_name).db_manager(instances[0]._state.db)
+    fetched = manager.in_bulk([instance.pk for instance in instances])
+    try:
+        return [fetched[instance.pk] for instance in instances]
+    except KeyError:
+        raise model.DoesNotExist(
+            '%s matching query does not exist.' % model._meta.object_name
+        )
+
+
+def _refresh_from_db(instances):
+    """
+    Does what `refresh_from_db()` does to each instance, reading them all
+    with one query.
+    """
+    model = type(instances[0])
+    using = instances[0]._state.db
+    fetched = model._base_manager.db_manager(using).in_bulk([i.pk for i in instances])
+    for instance in instances:
+        try:
+            db_instance = fetched[instance.pk]
+        except KeyError:
+            raise model.DoesNotExist(
+                '%s matching query does not exist.' % model._meta.object_name
+            )
+        instance._prefetched_objects_cache = {}
+        for field in model._meta.concrete_fields:
+            setattr(instance, field.attname, getattr(db_instance, field.attname))
+            if field.is_relation:
+                delete_cached_value(field, instance)
+        for field in model._meta.related_objects:
+            delete_cached_value(field, instance)
+        instance._state.db = db_instance._state.db
+
+
+def signals_disabled():
+    """
+    Returns a context manager inside which the current thread sends no
+    pre_save, post_save or m2m_changed signal, e.g. to skip expensive
+    receivers while seeding a database.
+    """
+    return signals.disabled()
+
+
+def _make_on_databases(using, parallel, save_kwargs, make_first):
+    """
+    Calls `make_first` with the save kwargs for the first database of
+    `using`, a database alias or a list of them, and copies all it saved
+    to the other ones.
+    """
+    if isinstance(using, str):
+        using = [using]
+    if not using:
+        raise ValueError('_using needs at least one database alias')
+    if 'using' in save_kwargs:
+        raise TypeError("Pass the database alias as _using, not in _save_kwargs")
+    first, others = using[0], using[1:]
+    with scope.recorded() as saved, transaction.atomic(using=first):
+        created = make_first(dict(save_kwargs, using=first))
+    if others:
+        _copy_to_databases(saved, first, others, parallel)
+    return created
+
+
+def _copy_to_databases(instances, using, others, parallel=False):
+    """
+    Copies the rows of `instances`, saved on `using`, with those of their
+    parents and automatic m2m tables, to the `others` databases with one
+    bulk insert per table.
+    """
+    tables = scope.dump(instances, using)
+
+    def copy_in_thread(alias):
+        try:
+            scope.insert(tables, alias)
+        finally:
+            connections[alias].close()
+
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(others)) as executor:
+            list(executor.map(copy_in_thread, others))
+    else:
+        for alias in others:
+            scope.insert(tables, alias)
+
+
+def prepare(_model, _quantity=None, _save_related=False, _lazy=False, **attrs):
     """
     Creates BUT DOESN'T persist an instance from a given model its
     associated models.
     It fill the fields with random values or you can specify
     which fields you want to define its values by yourself.
+    With `_lazy=True` the random values are generated on first access.
     """
     mommy = Mommy.create(_model)
     if _valid_quantity(_quantity):
         raise InvalidQuantityException
+    if _quantity and isinstance(mommy, Mommy):
+        options = {'_classified': mommy.classify_attrs(attrs)}
+    else:
+        options = attrs
+    if _lazy:
+        options['_lazy'] = True
 
     if _quantity:
-        return [mommy.prepare(_save_related=_save_related, **attrs) for i in range(_quantity)]
+        return [mommy.prepare(_save_related=_save_related, **options) for i in range(_quantity)]
     else:
-        return mommy.prepare(_save_related=_save_related, **attrs)
+        return mommy.prepare(_save_related=_save_related, **options)
+
+
+def generate_rows(_model, _quantity, _columnar=False, **attrs):
+    """
+    Generates the field values of `_quantity` objects of `_model` without
+    creating model instances, e.g. to feed `bulk_create`, raw SQL or CSV
+    files. Related objects are still created, and referenced by their pk.
+
+    Returns an iterator of tuples, with one item per column of its `columns`
+    attribute, or with `_columnar=True` a dict mapping column names to lists
+    of values.
+    """
+    if _quantity is None or _valid_quantity(_quantity):
+        raise InvalidQuantityException
+    mommy = _create_mommy(_model, 'generate_rows')
+    return mommy.generate_rows(_quantity, _columnar=_columnar, **attrs)
+
+
+def prepare_records(_model, _quantity, _save_related=False, **attrs):
+    """
+    Generates `_quantity` rows of `_model` like `generate_rows` and returns
+    them as a list of lightweight records: `__slots__` objects with one
+    attribute per concrete field attname, e.g. `owner_id` for `owner`.
+    Records take a fraction of the memory of prepared instances, and
+    `model_mommy.records.to_instances` turns them into unsaved instances.
+
+    Like `prepare`, no database is used: foreign keys not given are None,
+    unless `_save_related` is set to create the related objects.
+    """
+    if _quantity is None or _valid_quantity(_quantity):
+        raise InvalidQuantityException
+    mommy = _create_mommy(_model, 'prepare_records')
+    return mommy.prepare_records(_quantity, _save_related=_save_related, **attrs)
+
+
+def prepare_template(_model, _save_related=False, _vary=(), **attrs):
+    """
+    Prepares an instance of `_model` once and returns a Template handing out
+    copies of it. The copies get new values for unique fields, for the
+    fields named in `_vary` and for attributes given as iterators or
+    callables; every other value is copied over.
+    """
+    mommy = _create_mommy(_model, 'prepare_template')
+    return mommy.template(_save_related=_save_related, _vary=_vary, **attrs)
+
+
+def _create_mommy(_model, function_name):
+    mommy = Mommy.create(_model)
+    if not isinstance(mommy, Mommy):
+        raise InvalidCustomMommy(
+            'Custom Mommy classes must subclass Mommy to be used by %s' % function_name
+        )
+    return mommy
+
+
+# maps 'app.recipe_name' strings to the Recipe they point to
+_recipes = {}
 
 
 def _recipe(name):
+    try:
+        return _recipes[name]
+    except KeyError:
+        pass
+
     app, recipe_name = name.rsplit('.', 1)
-    return import_from_str('.'.join((app, 'mommy_recipes', recipe_name)))
+    module_path = '.'.join((app, 'mommy_recipes'))
+    try:
+        module = importlib.import_module(module_path)
+    except ImportError as exc:
+        # only a missing recipes module means an unknown recipe
+        if not exc.name or not (
+            module_path == exc.name or module_path.startswith(exc.name + '.')
+        ):
+            raise
+        raise RecipeNotFound(_recipe_not_found_message(name, _recipes))
+
+    recipe = getattr(module, recipe_name, None)
+    if recipe is None:
+        candidates = dict(
+            ('%s.%s' % (app, attr), value) for attr, value in _module_recipes(module)
+        )
+        raise RecipeNotFound(_recipe_not_found_message(name, candidates))
+
+    _recipes[name] = recipe
+    return recipe
+
+
+def _module_recipes(module):
+    from .recipe import Recipe
+    for attr, value in vars(module).items():
+        if isinstance(value, Recipe):
+            yield attr, value
+
+
+def _recipe_not_found_message(name, candidates):
+    message = "Could not find recipe '%s'." % name
+    suggestions = difflib.get_close_matches(name, candidates)
+    if suggestions:
+        message += ' Did you mean %s?' % ' or '.join("'%s'" % s for s in suggestions)
+    return message
+
+
+def autodiscover_recipes():
+    """
+    Imports the mommy_recipes module of every installed app and registers
+    its recipes, so later `make_recipe('app.recipe')` calls are a dict lookup.
+    """
+    for app_config in apps.get_app_configs():
+        if not module_has_submodule(app_config.module, 'mommy_recipes'):
+            continue
+        module = importlib.import_module('%s.mommy_recipes' % app_config.name)
+        for attr, recipe in _module_recipes(module):
+            _recipes['%s.%s' % (app_config.name, attr)] = recipe
+
+
+def fixture_scope(setup, using=DEFAULT_DB_ALIAS):
+    """
+    Returns a context manager that calls `setup` the first time it is used
+    and gives back its result, restoring the rows `setup` created and undoing
+    the changes made inside the block on every use.
+    """
+    return scope.FixtureScope(setup, using=using)
 
 
 def make_recipe(mommy_recipe_name, _quantity=None, **new_attrs):
@@ -95,12 +442,74 @@ def prepare_recipe(mommy_recipe_name, _quantity=None, _save_related=False, **new
     )
 
 
+# Django's ORM is synchronous and its connections are bound to the thread
+# that opened them, so the async API runs all database work in one
+# dedicated thread.
+_db_executor = None
+_db_executor_lock = threading.Lock()
+
+
+def _get_db_executor():
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                # no thread_name_prefix, which needs Python 3.6
+                _db_executor = ThreadPoolExecutor(max_workers=1)
+    return _db_executor
+
+
+def _run_in_db_thread(func, *args, **kwargs):
+    loop = asyncio.get_event_loop()
+    return loop.run_in_executor(_get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def amake(_model, _quantity=None, **attrs):
+    """
+    Coroutine version of `make`.
+
+    The instances are created in the database thread of model_mommy, so the
+    event loop is not blocked and several calls can be awaited together
+    with `asyncio.gather`.
+    """
+    return await _run_in_db_thread(make, _model, _quantity=_quantity, **attrs)
+
+
+async def aprepare(_model, _quantity=None, _save_related=False, **attrs):
+    """
+    Coroutine version of `prepare`.
+
+    Values are generated in the event loop, unless `_save_related` needs
+    to persist related instances, in which case the database thread is used.
+    """
+    if _save_related:
+        return await _run_in_db_thread(
+            prepare, _model, _quantity=_quantity, _save_related=True, **attrs
+        )
+    return prepare(_model, _quantity=_quantity, **attrs)
+
+
+async def amake_recipe(mommy_recipe_name, _quantity=None, **new_attrs):
+    return await _run_in_db_thread(make_recipe, mommy_recipe_name, _quantity, **new_attrs)
+
+
+async def aprepare_recipe(mommy_recipe_name, _quantity=None, _save_related=False, **new_attrs):
+    return await _run_in_db_thread(
+        prepare_recipe, mommy_recipe_name, _quantity, _save_related, **new_attrs
+    )
+
+
 class ModelFinder(object):
     """
     Encapsulates all the logic for finding a model to Mommy.
+
+    The lookup index is shared by all finders, built on first use and
+    dropped whenever a model is registered or INSTALLED_APPS changes.
     """
-    _unique_models = None
+    # maps 'modelname' and 'app_label.modelname' (lowercased) to models
+    _models = None
     _ambiguous_models = None
+    _lock = threading.Lock()
 
     def get_model(self, name):
         """
@@ -109,16 +518,10 @@ class ModelFinder(object):
         :param name String on the form 'applabel.modelname' or 'modelname'.
         :return a model class.
         """
-        try:
-            if '.' in name:
-                app_label, model_name = name.split('.')
-                model = apps.get_model(app_label, model_name)
-            else:
-                model = self.get_model_by_name(name)
-        except LookupError:
-            model = None
-
-        if not model:
+        model = self._get_index().get(name.lower())
+        if model is None:
+            if '.' not in name:
+                self._check_ambiguous(name.lower())
             raise ModelNotFound("Could not find model '%s'." % name.title())
 
         return model
@@ -131,37 +534,69 @@ class ModelFinder(object):
         raises AmbiguousModelName.
         """
         name = name.lower()
+        model = self._get_index().get(name) if '.' not in name else None
+        if model is None:
+            self._check_ambiguous(name)
+        return model
 
-        if self._unique_models is None:
-            self._populate()
-
+    def _check_ambiguous(self, name):
         if name in self._ambiguous_models:
             raise AmbiguousModelName('%s is a model in more than one app. '
                                      'Use the form "app.model".' % name.title())
 
-        return self._unique_models.get(name)
+    @classmethod
+    def _get_index(cls):
+        models = ModelFinder._models
+        if models is None:
+            with cls._lock:
+                if ModelFinder._models is None:
+                    cls._populate()
+                models = ModelFinder._models
+        return models
 
-    def _populate(self):
+    @classmethod
+    def _populate(cls):
         """
-        Cache models for faster self._get_model.
+        Cache models for faster self.get_model.
         """
-        unique_models = {}
-        ambiguous_models = []
+        apps.check_models_ready()
+        models = {}
+        ambiguous_models = set()
+
+        for app_label, app_models in apps.all_models.items():
+            installed = app_label in apps.app_configs
+            for name, model in app_models.items():
+                if installed:
+                    models['%s.%s' % (app_label.lower(), name)] = model
+                if name in ambiguous_models:
+                    continue
+                if name in models:
+                    ambiguous_models.add(name)
+                    del models[name]
+                else:
+                    models[name] = model
 
-        all_models = apps.all_models
+        # _models is set last since it flags the cache as ready.
+        ModelFinder._ambiguous_models = ambiguous_models
+        ModelFinder._models = models
+
+    @classmethod
+    def clear_cache(cls, **kwargs):
+        with cls._lock:
+            ModelFinder._models = None
 
-        for app_model in all_models.values():
-            for name, model in app_model.items():
-                if name not in unique_models:
-                    unique_models[name] = model
-                else:
-                    ambiguous_models.append(name)
 
-        for name in ambiguous_models:
-            unique_models.pop(name, None)
+def _clear_finder_cache_on_installed_apps_change(setting, **kwargs):
+    if setting == 'INSTALLED_APPS':
+        ModelFinder.clear_cache()
 
-        self._ambiguous_models = ambiguous_models
-        self._unique_models = unique_models
+
+class_prepared.connect(ModelFinder.clear_cache, dispatch_uid='model_mommy_finder_models')
+setting_changed.connect(
+    _clear_finder_cache_on_installed_apps_change, dispatch_uid='model_mommy_finder_apps'
+)
+
+finder = ModelFinder()
 
 
 def is_iterator(value):
@@ -194,13 +629,141 @@ def _custom_mommy_class():
         raise CustomMommyNotFound("Could not find custom mommy class '%s'" % custom_class_string)
 
 
+class MakeContext(object):
+    """
+    Holds the state of a single make/prepare call, so one Mommy instance
+    can be used from several threads, or reentrantly, at the same time.
+    """
+
+    def __init__(self):
+        self.m2m_dict = {}
+        self.iterator_attrs = {}
+        self.model_attrs = {}
+        self.rel_attrs = {}
+        self.rel_fields = []
+        self.rel_tree = {}
+        self.fill_in_optional = set()
+        self.skip_fields = set()
+        self.one_to_many_names = set()
+        # database the instance is saved on, if not the default one
+        self.using = None
+
+    def for_row(self):
+        """
+        Returns a context for one more instance of the same call: attributes
+        are classified once and only `model_attrs` and `m2m_dict`, which are
+        filled in per instance, are new.
+        """
+        context = MakeContext.__new__(MakeContext)
+        context.__dict__.update(self.__dict__)
+        context.model_attrs = dict(self.model_attrs)
+        context.m2m_dict = {}
+        return context
+
+
+class Template(object):
+    """
+    A prepared instance to copy from, see `prepare_template`.
+
+    Copies are built by copying the instance `__dict__`, together with the
+    related instances it holds, and generating the varying values only.
+    """
+
+    def __init__(self, mommy, context, instance, varying, dynamic, commit):
+        self.mommy = mommy
+        self.context = context
+        self.instance = instance
+        self.varying = varying
+        self.dynamic = dynamic
+        self.commit = commit
+        # values that copies should not share
+        self.mutable = [
+            k for k, v in instance.__dict__.items() if isinstance(v, (list, dict, set))
+        ]
+
+    def copy(self):
+        instance = _copy_instance(self.instance, {})
+        for name in self.mutable:
+            instance.__dict__[name] = instance.__dict__[name].copy()
+        if self.varying:
+            with self.mommy._use_context(self.context):
+                for field in self.varying:
+                    setattr(instance, field.name, self.mommy.generate_value(field, self.commit))
+        for name, value in self.dynamic.items():
+            setattr(instance, name, self.mommy._dynamic_value(name, value))
+        return instance
+
+    def copies(self, quantity):
+        return [self.copy() for _ in range(quantity)]
+
+
+def _copy_instance(instance, memo):
+    copy = memo.get(id(instance))
+    if copy is not None:
+        return copy
+    cls = type(instance)
+    copy = memo[id(instance)] = cls.__new__(cls)
+    values = instance.__dict__.copy()
+    state = values['_state'] = ModelState()
+    state.db = instance._state.db
+    state.adding = instance._state.adding
+    if hasattr(ModelState, 'fields_cache'):
+        cache = instance._state.fields_cache
+        if cache:
+            state.fields_cache = dict(
+                (k, v if v is None else _copy_instance(v, memo)) for k, v in cache.items()
+            )
+    else:  # Django < 2.0 caches related instances in __dict__
+        for k, v in values.items():
+            if isinstance(v, Model):
+                values[k] = _copy_instance(v, memo)
+    copy.__dict__ = values
+    return copy
+
+
+class GeneratedRows(object):
+    """
+    Iterator over the tuples returned by `generate_rows`, their items
+    following the column names in `columns` and the model fields in
+    `fields`.
+    """
+
+    def __init__(self, fields, rows):
+        self.fields = tuple(fields)
+        self.columns = tuple(f.column for f in fields)
+        self._rows = rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._rows)
+
+
+def _column_value(field, values):
+    value = values.get(field.name, values.get(field.attname))
+    if field.is_relation and hasattr(value, '_meta'):
+        return getattr(value, field.target_field.attname)
+    return value
+
+
+def _context_attribute(name):
+    def getter(self):
+        return getattr(self.context, name)
+
+    def setter(self, value):
+        setattr(self.context, name, value)
+
+    return property(getter, setter)
+
+
 class Mommy(object):
     attr_mapping = {}
     type_mapping = None
 
     # Note: we're using one finder for all Mommy instances to avoid
     # rebuilding the model cache for every make_* or prepare_* call.
-    finder = ModelFinder()
+    finder = finder
 
     @classmethod
     def create(cls, _model, make_m2m=False, create_files=False):
@@ -213,11 +776,10 @@ class Mommy(object):
     def __init__(self, _model, make_m2m=False, create_files=False):
         self.make_m2m = make_m2m
         self.create_files = create_files
-        self.m2m_dict = {}
-        self.iterator_attrs = {}
-        self.model_attrs = {}
-        self.rel_attrs = {}
-        self.rel_fields = []
+        self._local = threading.local()
+        # unique field name or unique_together names -> values iterator or seen set
+        self.unique_values = {}
+        self._unique_lock = threading.Lock()
 
         if isinstance(_model, ModelBase):
             self.model = _model
@@ -226,8 +788,43 @@ class Mommy(object):
 
         self.init_type_mapping()
 
+    m2m_dict = _context_attribute('m2m_dict')
+    iterator_attrs = _context_attribute('iterator_attrs')
+    model_attrs = _context_attribute('model_attrs')
+    rel_attrs = _context_attribute('rel_attrs')
+    rel_fields = _context_attribute('rel_fields')
+    rel_tree = _context_attribute('rel_tree')
+    fill_in_optional = _context_attribute('fill_in_optional')
+    skip_fields = _context_attribute('skip_fields')
+    one_to_many_names = _context_attribute('one_to_many_names')
+    using = _context_attribute('using')
+
+    @property
+    def context(self):
+        """
+        The MakeContext of the call running in the current thread.
+        """
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self._local.context = MakeContext()
+        return context
+
+    @contextmanager
+    def _use_context(self, context):
+        previous = getattr(self._local, 'context', None)
+        self._local.context = context
+        try:
+            yield context
+        finally:
+            self._local.context = previous
+
+    def _new_context(self):
+        return self._use_context(MakeContext())
+
     def init_type_mapping(self):
         self.type_mapping = generators.get_type_mapping()
+        if getattr(settings, 'MOMMY_GIS_GEOS', False):
+            self.type_mapping.update(gis.geos_gis_mapping)
         generators_from_settings = getattr(settings, 'MOMMY_CUSTOM_FIELDS_GEN', {})
         for k, v in generators_from_settings.items():
             field_class = import_if_str(k)
@@ -253,10 +850,103 @@ class Mommy(object):
         params.update(attrs)
         return self._make(**params)
 
-    def prepare(self, _save_related=False, **attrs):
+    def prepare(self, _save_related=False, _lazy=False, **attrs):
         """Creates, but does not persist, an instance of the model
-        associated with Mommy instance."""
-        return self._make(commit=False, commit_related=_save_related, **attrs)
+        associated with Mommy instance.
+
+        With `_lazy`, field values not given in `attrs` are only generated
+        when first accessed, or when the instance is saved."""
+        return self._make(commit=False, commit_related=_save_related, _lazy=_lazy, **attrs)
+
+    def classify_attrs(self, attrs):
+        """Sorts `attrs` out the way `make` and `prepare` do and returns
+        the result, to be passed as `_classified` when making several
+        instances with the same attributes."""
+        context = MakeContext()
+        with self._use_context(context):
+            self._clean_attrs(dict(attrs))
+        return context
+
+    def generate_rows(self, _quantity, _columnar=False, **attrs):
+        """Returns the values of `_quantity` rows of the model, see the
+        `generate_rows` function."""
+        fields = [
+            f for f in self.model._meta.concrete_fields
+            if not isinstance(f, AutoField) or f.name in attrs or f.attname in attrs
+        ]
+        rows = GeneratedRows(fields, self._generate_rows(_quantity, fields, attrs))
+        if not _columnar:
+            return rows
+        return OrderedDict(zip(rows.columns, (list(c) for c in zip(*rows))))
+
+    def _generate_rows(self, quantity, fields, attrs, commit=True):
+        with self._new_context():
+            self._clean_attrs(attrs)
+            given = self.model_attrs
+            for _ in range(quantity):
+                values = self.model_attrs = dict(given)
+                generated = set()
+                for field in fields:
+                    name = field.name
+                    if name in values:
+                        if name in self.iterator_attrs or callable(values[name]):
+                            values[name] = self._dynamic_value(name, values[name])
+                    elif field.attname in values:
+                        continue
+                    elif name in self.skip_fields:
+                        values[name] = field.get_default()
+                    elif field.is_relation and not commit:
+                        # related objects would be neither saved nor kept
+                        values[name] = None
+                    else:
+                        values[name] = self.generate_value(field, commit)
+                        generated.add(name)
+                if generated:
+                    self._ensure_unique_together(generated, commit)
+                yield tuple([_column_value(field, values) for field in fields])
+
+    def prepare_records(self, _quantity, _save_related=False, **attrs):
+        """Returns `_quantity` records of the model, see the
+        `prepare_records` function."""
+        record = records.record_class(self.model)
+        fields = self.model._meta.concrete_fields
+        # auto fields are left to the database, with a None value
+        rows = self._generate_rows(_quantity, fields, attrs, commit=_save_related)
+        return [record(*row) for row in rows]
+
+    def template(self, _save_related=False, _vary=(), **attrs):
+        """Prepares an instance once and returns a Template to copy it
+        cheaply, see `prepare_template`."""
+        dynamic = dict(
+            (k, v) for k, v in attrs.items()
+            if '__' not in k and (is_iterator(v) or callable(v))
+        )
+        static = dict((k, v) for k, v in attrs.items() if k not in dynamic)
+        instance = self.prepare(_save_related=_save_related, **static)
+
+        # state generate_value needs for the varying fields, e.g. attributes
+        # of related instances
+        context = MakeContext()
+        with self._use_context(context):
+            self._clean_attrs(static)
+
+        wrong_fields = set(_vary) - set(f.name for f in self.model._meta.concrete_fields)
+        if wrong_fields:
+            raise AttributeError(
+                '_vary field(s) %s are not related to model %s'
+                % (list(wrong_fields), self.model.__name__)
+            )
+        varying = [
+            field for field in self.model._meta.concrete_fields
+            if field.name not in dynamic and (
+                field.name in _vary or (
+                    field.unique and not field.is_relation and
+                    not isinstance(field, AutoField) and field.name not in attrs and
+                    getattr(instance, field.attname) is not None
+                )
+            )
+        ]
+        return Template(self, context, instance, varying, dynamic, _save_related)
 
     def get_fields(self):
         return self.model._meta.fields + self.model._meta.many_to_many
@@ -271,65 +961,109 @@ class Mommy(object):
         _save_kwargs=None,
         _refresh_after_create=False,
         _from_manager=None,
+        _lazy=False,
+        _deferred_related=None,
+        _classified=None,
         **attrs
     ):
         _save_kwargs = _save_kwargs or {}
 
-        self._clean_attrs(attrs)
-        for field in self.get_fields():
-            if self._skip_field(field):
-                continue
-
-            if isinstance(field, ManyToManyField):
-                if field.name not in self.model_attrs:
-                    self.m2m_dict[field.name] = self.m2m_value(field)
-                else:
-                    self.m2m_dict[field.name] = self.model_attrs.pop(field.name)
-            elif field.name not in self.model_attrs:
-                if not isinstance(field, ForeignKey) or \
-                        '{0}_id'.format(field.name) not in self.model_attrs:
-                    self.model_attrs[field.name] = self.generate_value(field, commit_related)
-            elif callable(self.model_attrs[field.name]):
-                self.model_attrs[field.name] = self.model_attrs[field.name]()
-            elif field.name in self.iterator_attrs:
-                try:
-                    self.model_attrs[field.name] = next(self.iterator_attrs[field.name])
-                except StopIteration:
-                    raise RecipeIteratorEmpty('{0} iterator is empty.'.format(field.name))
-
-        instance = self.instance(
-            self.model_attrs,
-            _commit=commit,
-            _save_kwargs=_save_kwargs,
-            _from_manager=_from_manager,
-        )
-        if commit:
-            for related in self.get_related():
-                self.create_by_related_name(instance, related)
-
-        if _refresh_after_create:
-            instance.refresh_from_db()
-
-        return instance
+        context = MakeContext() if _classified is None else _classified.for_row()
+        with self._use_context(context):
+            pending = {}
+            generated = set()
+            if _classified is None:
+                self._clean_attrs(attrs)
+            if commit:
+                context.using = _save_kwargs.get('using')
+            for field in self.get_fields():
+                if field.name in self.skip_fields:
+                    continue
+
+                if isinstance(field, ManyToManyField):
+                    if field.name not in self.model_attrs:
+                        self.m2m_dict[field.name] = self.m2m_value(field)
+                    else:
+                        self.m2m_dict[field.name] = self.model_attrs.pop(field.name)
+                elif field.name not in self.model_attrs:
+                    if not isinstance(field, ForeignKey) or \
+                            '{0}_id'.format(field.name) not in self.model_attrs:
+                        if _lazy:
+                            pending[field.name] = self._lazy_value(
+                                context, field, commit_related
+                            )
+                        else:
+                            self.model_attrs[field.name] = self.generate_value(
+                                field, commit_related
+                            )
+                            generated.add(field.name)
+                elif field.name in self.iterator_attrs or callable(self.model_attrs[field.name]):
+                    self.model_attrs[field.name] = self._dynamic_value(
+                        field.name, self.model_attrs[field.name]
+                    )
+
+            if generated:
+                self._ensure_unique_together(generated, commit_related)
+
+            instance = self.instance(
+                self.model_attrs,
+                _commit=commit,
+                _save_kwargs=_save_kwargs,
+                _from_manager=_from_manager,
+            )
+            if pending:
+                lazy.make_lazy(instance, pending)
+            if commit:
+                for related in self.get_related():
+                    if _deferred_related is None:
+                        self.create_by_related_name(instance, related)
+                    else:
+                        kwargs = self._related_attrs(instance, related)
+                        if kwargs is not None:
+                            _deferred_related.append((related, kwargs))
+
+            if _refresh_after_create:
+                instance.refresh_from_db()
+
+            return instance
+
+    def _dynamic_value(self, name, value):
+        """
+        Returns the value of attribute `name` for one more instance, from
+        `value` given as an iterator or a callable.
+        """
+        if is_iterator(value):
+            try:
+                with _iterator_lock:
+                    return next(value)
+            except StopIteration:
+                raise RecipeIteratorEmpty('{0} iterator is empty.'.format(name))
+        return value()
+
+    def _lazy_value(self, context, field, commit):
+        def generate():
+            with self._use_context(context):
+                return self.generate_value(field, commit)
+        return generate
 
     def m2m_value(self, field):
         if field.name in self.rel_fields:
             return self.generate_value(field)
-        if not self.make_m2m or field.null and not field.fill_optional:
+        if not self.make_m2m or field.null and field.name not in self.fill_in_optional:
             return []
         return self.generate_value(field)
 
     def instance(self, attrs, _commit, _save_kwargs, _from_manager):
         one_to_many_keys = {}
-        for k in tuple(attrs.keys()):
-            field = getattr(self.model, k, None)
-            if isinstance(field, ForeignRelatedObjectsDescriptor):
+        for k in self.one_to_many_names:
+            if k in attrs:
                 one_to_many_keys[k] = attrs.pop(k)
 
         instance = self.model(**attrs)
         # m2m only works for persisted instances
         if _commit:
             instance.save(**_save_kwargs)
+            scope.record(instance)
             self._handle_one_to_many(instance, one_to_many_keys)
             self._handle_m2m(instance)
 
@@ -338,48 +1072,77 @@ class Mommy(object):
                 # 'objects'. This will ensure any additional code
                 # within its get_queryset() method (e.g. annotations)
                 # is run.
-                manager = getattr(self.model, _from_manager)
+                manager = getattr(self.model, _from_manager).db_manager(instance._state.db)
                 instance = manager.get(pk=instance.pk)
 
         return instance
 
     def create_by_related_name(self, instance, related):
+        kwargs = self._related_attrs(instance, related)
+        if kwargs is not None:
+            make(**kwargs)
+
+    def _related_attrs(self, instance, related):
         rel_name = related.get_accessor_name()
         if rel_name not in self.rel_fields:
-            return
+            return None
 
-        kwargs = filter_rel_attrs(rel_name, **self.rel_attrs)
+        kwargs = dict(self.rel_tree[rel_name])
         kwargs[related.field.name] = instance
         kwargs['_model'] = related.field.model
+        kwargs.update(self._related_options())
+        return kwargs
 
-        make(**kwargs)
+    def _related_options(self):
+        # objects made for the instance go to the same database
+        if self.using is None:
+            return {}
+        return {'_save_kwargs': {'using': self.using}}
 
     def _clean_attrs(self, attrs):
         def is_rel_field(x):
             return '__' in x
-        self.fill_in_optional = attrs.pop('_fill_optional', False)
-        # error for non existing fields
-        if isinstance(self.fill_in_optional, (tuple, list, set)):
-            # parents and relations
-            wrong_fields = set(self.fill_in_optional) - set(
-                f.name for f in self.get_fields()
-            )
-            if wrong_fields:
-                raise AttributeError(
-                    '_fill_optional field(s) %s are not related to model %s'
-                    % (list(wrong_fields), self.model.__name__)
-                )
+        fields = self.get_fields()
+        self.fill_in_optional = self._fill_optional_names(
+            attrs.pop('_fill_optional', False), fields
+        )
         self.iterator_attrs = dict((k, v) for k, v in attrs.items() if is_iterator(v))
         self.model_attrs = dict((k, v) for k, v in attrs.items() if not is_rel_field(k))
         self.rel_attrs = dict((k, v) for k, v in attrs.items() if is_rel_field(k))
-        self.rel_fields = [x.split('__')[0] for x in self.rel_attrs.keys() if is_rel_field(x)]
+        self.rel_tree = parse_rel_attrs(self.rel_attrs)
+        self.rel_fields = list(self.rel_tree)
+        self.one_to_many_names = set(
+            k for k in self.model_attrs
+            if isinstance(getattr(self.model, k, None), ForeignRelatedObjectsDescriptor)
+        )
+        # Decide once per call which fields are left alone, so the
+        # generation loop only needs a set lookup per field.
+        self.skip_fields = set(f.name for f in fields if self._skip_field(f))
+
+    def _fill_optional_names(self, fill_optional, fields):
+        """
+        Normalizes the `_fill_optional` argument into a set of field names.
+        """
+        if fill_optional is True:
+            return set(f.name for f in fields)
+        if fill_optional is False:
+            return set()
+        if not isinstance(fill_optional, (tuple, list, set)):
+            raise TypeError(
+                '_fill_optional must be a boolean or a list of field names, not %s'
+                % type(fill_optional).__name__
+            )
+        # error for non existing fields (parents and relations)
+        wrong_fields = set(fill_optional) - set(f.name for f in fields)
+        if wrong_fields:
+            raise AttributeError(
+                '_fill_optional field(s) %s are not related to model %s'
+                % (list(wrong_fields), self.model.__name__)
+            )
+        return set(fill_optional)
 
     def _skip_field(self, field):
-        # check for fill optional argument
-        if isinstance(self.fill_in_optional, bool):
-            field.fill_optional = self.fill_in_optional
-        else:
-            field.fill_optional = field.name in self.fill_in_optional
+        fill_optional = field.name in self.fill_in_optional
 
         if isinstance(field, FileField) and not self.create_files:
             return True
@@ -398,7 +1161,7 @@ class Mommy(object):
         ]):
             # Django is quirky in that BooleanFields are always "blank",
             # but have no default.
-            if not field.fill_optional and (
+            if not fill_optional and (
                 not issubclass(field.__class__, Field) or
                 field.has_default() or
                 (field.blank and not isinstance(field, BooleanField))
@@ -406,7 +1169,7 @@ class Mommy(object):
                 return True
 
         if field.name not in self.model_attrs:
-            if field.name not in self.rel_fields and (field.null and not field.fill_optional):
+            if field.name not in self.rel_fields and (field.null and not fill_optional):
                 return True
 
         return False
@@ -425,7 +1188,8 @@ class Mommy(object):
         for key, values in self.m2m_dict.items():
             for value in values:
                 if not value.pk:
-                    value.save()
+                    value.save(using=instance._state.db)
+                    scope.record(value)
             m2m_relation = getattr(instance, key)
             through_model = m2m_relation.through
 
@@ -438,6 +1202,7 @@ class Mommy(object):
                         m2m_relation.source_field_name: instance,
                         m2m_relation.target_field_name: value
                     }
+                    base_kwargs.update(self._related_options())
                     make(through_model, **base_kwargs)
 
     def _remote_field(self, field):
@@ -457,6 +1222,18 @@ class Mommy(object):
         `attr_mapping` and `type_mapping` can be defined easily overwriting the
         model.
         """
+        generator, generator_attrs = self._field_generator(field, commit)
+        if generator is None:
+            return field.default
+        if field.unique and not field.is_relation:
+            return self.generate_unique_value(field, generator, generator_attrs)
+        return generator(**generator_attrs)
+
+    def _field_generator(self, field, commit=True):
+        """
+        Returns the generator of `field` and the arguments to call it with,
+        or (None, None) when the field default is used instead.
+        """
         if field.name in self.attr_mapping:
             generator = self.attr_mapping[field.name]
         elif getattr(field, 'choices'):
@@ -469,7 +1246,7 @@ class Mommy(object):
         elif field.__class__ in self.type_mapping:
             generator = self.type_mapping[field.__class__]
         elif field.has_default():
-            return field.default
+            return None, None
         else:
             raise TypeError('%s is not supported by mommy.' % field.__class__)
 
@@ -477,12 +1254,80 @@ class Mommy(object):
         # generating the value.
         generator_attrs = get_required_values(generator, field)
 
-        if field.name in self.rel_fields:
-            generator_attrs.update(filter_rel_attrs(field.name, **self.rel_attrs))
+        if field.name in self.rel_tree:
+            generator_attrs.update(self.rel_tree[field.name])
 
         if not commit:
             generator = getattr(generator, 'prepare', generator)
-        return generator(**generator_attrs)
+        elif generator in (random_gen.gen_related, random_gen.gen_m2m):
+            generator_attrs.update(self._related_options())
+        return generator, generator_attrs
+
+    def generate_unique_value(self, field, generator, generator_attrs):
+        """
+        Returns a value not returned before by this Mommy instance for the
+        field, so the objects of a `_quantity` batch never collide.
+
+        Values come from the `unique` iterator of the generator, falling back
+        to sampling the generator while skipping values already seen.
+        """
+        with self._unique_lock:
+            values = self.unique_values.get(field.name)
+            if values is None:
+                values = self.unique_values[field.name] = _unique_iterator(
+                    generator, generator_attrs
+                )
+            try:
+                return next(values)
+            except StopIteration:
+                raise UniqueValuesExhausted(
+                    'Could not generate more unique values for %s.%s.'
+                    % (self.model.__name__, field.name)
+                )
+
+    def _ensure_unique_together(self, generated, commit):
+        """
+        Replaces the generated fields of unique_together groups with values
+        drawn, without replacement, from the combinations of the unique
+        values of those fields, so this Mommy instance never repeats them.
+        """
+        opts = self.model._meta
+        for names in opts.unique_together:
+            fields = [opts.get_field(name) for name in names if name in generated]
+            # new related instances and unique values are never repeated
+            if not fields or any(f.is_relation or f.unique for f in fields):
+                continue
+            key = tuple(f.name for f in fields)
+            with self._unique_lock:
+                values = self.unique_values.get(key)
+                if values is None:
+                    values = self.unique_values[key] = random_gen.gen_unique_tuples(
+                        self._unique_field_values(field, commit) for field in fields
+                    )
+                try:
+                    self.model_attrs.update(zip(key, next(values)))
+                except StopIteration:
+                    raise UniqueValuesExhausted(
+                        'Could not generate more unique values for %s.%s.'
+                        % (self.model.__name__, ', '.join(names))
+                    )
+
+    def _unique_field_values(self, field, commit):
+        generator, generator_attrs = self._field_generator(field, commit)
+        if generator is None:
+            return iter([field.default])
+        return _unique_iterator(generator, generator_attrs)
+
+
+def _unique_iterator(generator, generator_attrs):
+    """
+    Returns an iterator of distinct values of `generator`: its `unique`
+    iterator, or samples of the generator skipping values already seen.
+    """
+    unique = getattr(generator, 'unique', None)
+    if unique is None:
+        return random_gen.gen_unique_samples(generator, **generator_attrs)
+    return unique(**generator_attrs)
 
 
 def get_required_values(generator, field):
@@ -512,14 +1357,26 @@ def get_required_values(generator, field):
 
 
 def filter_rel_attrs(field_name, **rel_attrs):
+    prefix = field_name + '__'
     clean_dict = {}
 
     for k, v in rel_attrs.items():
-        if k.startswith(field_name + '__'):
-            splitted_key = k.split('__')
-            key = '__'.join(splitted_key[1:])
-            clean_dict[key] = v
+        if k.startswith(prefix):
+            clean_dict[k[len(prefix):]] = v
         else:
             clean_dict[k] = v
 
     return clean_dict
+
+
+def parse_rel_attrs(rel_attrs):
+    """
+    Groups `field__attr` style attributes by field, e.g.
+    {'owner__name': 'Bob', 'owner__home__city': 'X'} becomes
+    {'owner': {'name': 'Bob', 'home__city': 'X'}}.
+    """
+    tree = OrderedDict()
+    for k, v in rel_attrs.items():
+        name, attr = k.split('__', 1)
+        tree.setdefault(name, {})[attr] = v
+    return tree
@@ -9,19 +9,28 @@ list in the format (key, value) where key is the argument name for generator
 and value is the value for that argument.
 """
 
+import itertools
 import string
 import warnings
-from decimal import Decimal
+from datetime import datetime, timedelta
+from decimal import Context, Decimal, MAX_PREC, ROUND_CEILING, ROUND_FLOOR
+from math import gcd
 from os.path import abspath, join, dirname
-from random import randint, choice, random, uniform
+from random import randint, randrange, choice, random, uniform
 
-from model_mommy.timezone import now
+from model_mommy.timezone import datetime_range, now
 
 
 MAX_LENGTH = 300
 # Using sys.maxint here breaks a bunch of tests when running against a
 # Postgres database.
 MAX_INT = 10000
+# Consecutive collisions after which gen_unique_samples gives up.
+MAX_UNIQUE_TRIES = 100
+# Above this many possible values, sampling is cheaper than a permutation.
+MAX_PERMUTATION_SIZE = 2 ** 32
+# Scaling decimals must never round them.
+_DECIMAL_CONTEXT = Context(prec=MAX_PREC)
 
 
 def get_content_file(content, name):
@@ -53,6 +62,89 @@ def gen_from_list(L):
     return lambda: choice(list(L))
 
 
+# -- UNIQUE VALUES --
+#
+# A generator can have an `unique` attribute: a callable receiving the same
+# arguments as the generator and returning an iterator of distinct values,
+# which is used for fields with unique=True.
+
+
+def gen_permutation(size):
+    """
+    Yields every integer in range(size) once, in a shuffled order, without
+    keeping track of the values already returned.
+    """
+    start = randrange(size)
+    step = randint(1, size)
+    while gcd(step, size) != 1:
+        step = randint(1, size)
+    for i in range(size):
+        yield (start + i * step) % size
+
+
+def gen_unique_samples(generator, **attrs):
+    """
+    Yields distinct values of `generator`, stopping after MAX_UNIQUE_TRIES
+    consecutive collisions.
+    """
+    seen = set()
+    while True:
+        for _ in range(MAX_UNIQUE_TRIES):
+            value = generator(**attrs)
+            if value not in seen:
+                break
+        else:
+            return
+        seen.add(value)
+        yield value
+
+
+def gen_unique_tuples(iterators):
+    """
+    Yields distinct tuples holding one value of each iterator, which must
+    yield distinct values, until every combination was returned.
+
+    Iterators are only consumed as needed: each new value, drawn from the
+    iterator with the fewest values so far, is combined with the values of
+    the others drawn before, and those tuples are returned in a shuffled
+    order before the next value is drawn.
+    """
+    iterators = list(iterators)
+    pools = [[] for _ in iterators]
+    active = list(range(len(iterators)))
+    pending = []
+    while True:
+        while not pending:
+            if not active:
+                return
+            i = min(active, key=lambda i: len(pools[i]))
+            try:
+                value = next(iterators[i])
+            except StopIteration:
+                active.remove(i)
+                continue
+            pending.extend(itertools.product(*(pools[:i] + [[value]] + pools[i + 1:])))
+            pools[i].append(value)
+        j = randrange(len(pending))
+        pending[j], pending[-1] = pending[-1], pending[j]
+        yield pending.pop()
+
+
+def _gen_unique_strings(chars, max_length):
+    size = len(chars) ** max_length
+    if size > MAX_PERMUTATION_SIZE:
+        return gen_unique_samples(lambda: ''.join(choice(chars) for _ in range(max_length)))
+
+    def to_string(n):
+        digits = []
+        for _ in range(max_length):
+            n, i = divmod(n, len(chars))
+            digits.append(chars[i])
+        return ''.join(digits)
+
+    return (to_string(n) for n in gen_permutation(size))
+
+
 # -- DEFAULT GENERATORS --
 
 
@@ -71,33 +163,139 @@ def gen_integer(min_int=-MAX_INT, max_int=MAX_INT):
     return randint(min_int, max_int)
 
 
+def gen_unique_integers(min_int=-MAX_INT, max_int=MAX_INT):
+    return (min_int + n for n in gen_permutation(max_int - min_int + 1))
+
+
+gen_integer.unique = gen_unique_integers
+
+
+def gen_positive_integer():
+    return gen_integer(min_int=0)
+
+
+gen_positive_integer.unique = lambda: gen_unique_integers(min_int=0)
+
+
 def gen_float():
     return random() * gen_integer()
 
 
-def gen_decimal(max_digits, decimal_places):
-    def num_as_str(x):
-        return ''.join([str(randint(0, 9)) for _ in range(x)])
-
-    if decimal_places:
-        return Decimal("%s.%s" % (num_as_str(max_digits - decimal_places - 1),
-                                  num_as_str(decimal_places)))
-    return Decimal(num_as_str(max_digits))
+def _value_limit(validator_class_name):
+    def limit(field):
+        # the validator is looked up by class name to keep this module
+        # independent of Django
+        limit_value = None
+        for validator in field.validators:
+            if type(validator).__name__ == validator_class_name:
+                limit_value = validator.limit_value
+                if callable(limit_value):
+                    limit_value = limit_value()
+        key = 'min_value' if validator_class_name == 'MinValueValidator' else 'max_value'
+        return key, limit_value
+    return limit
+
+
+def _to_units(value, scale, rounding):
+    # str() keeps floats like 0.1 from turning into 0.1000000000000000055...
+    units = _DECIMAL_CONTEXT.multiply(Decimal(str(value)), scale)
+    return int(units.to_integral_value(rounding))
+
+
+def _decimal_bounds(max_digits, decimal_places, min_value=None, max_value=None):
+    """
+    Returns the lowest and highest valid values as integers in units of
+    10 ** -decimal_places.
+    """
+    largest = 10 ** max_digits - 1
+    low = 0
+    # keep the integer part, if any, one digit shorter than allowed
+    high = 10 ** (max_digits - 1) - 1 if 0 < decimal_places < max_digits else largest
+    scale = Decimal(1).scaleb(decimal_places, _DECIMAL_CONTEXT)
+    if min_value is not None:
+        low = max(_to_units(min_value, scale, ROUND_CEILING), -largest)
+        if low > high:
+            high = largest
+    if max_value is not None:
+        high = min(_to_units(max_value, scale, ROUND_FLOOR), largest)
+        if low > high and min_value is None:
+            low = -largest
+    if low > high:
+        raise ValueError('No decimal with %s digits and %s decimal places between %s and %s.'
+                         % (max_digits, decimal_places, min_value, max_value))
+    return low, high
+
+
+def gen_decimal(max_digits, decimal_places, min_value=None, max_value=None):
+    low, high = _decimal_bounds(max_digits, decimal_places, min_value, max_value)
+    return Decimal(randint(low, high)).scaleb(-decimal_places, _DECIMAL_CONTEXT)
+
+
+def gen_decimals(count, max_digits, decimal_places, min_value=None, max_value=None):
+    """
+    Returns a list of `count` random decimals, computing the bounds only once.
+    """
+    low, high = _decimal_bounds(max_digits, decimal_places, min_value, max_value)
+    return [
+        Decimal(randint(low, high)).scaleb(-decimal_places, _DECIMAL_CONTEXT)
+        for _ in range(count)
+    ]
+
+
+def gen_unique_decimals(max_digits, decimal_places, min_value=None, max_value=None):
+    low, high = _decimal_bounds(max_digits, decimal_places, min_value, max_value)
+    return (
+        Decimal(low + n).scaleb(-decimal_places, _DECIMAL_CONTEXT)
+        for n in gen_permutation(high - low + 1)
+    )
 
 
-gen_decimal.required = ['max_digits', 'decimal_places']
+gen_decimal.required = [
+    'max_digits', 'decimal_places',
+    _value_limit('MinValueValidator'), _value_limit('MaxValueValidator'),
+]
+gen_decimal.unique = gen_unique_decimals
 
 
 def gen_date():
-    return now().date()
+    return gen_datetime().date()
 
 
 def gen_datetime():
-    return now()
+    date_range = datetime_range()
+    if date_range is None:
+        return now()
+    start, span = date_range
+    return start + timedelta(microseconds=randrange(span))
+
+
+def gen_datetimes(count):
+    """
+    Returns a list of `count` datetimes spread over `MOMMY_DATETIME_RANGE`,
+    computed as random offsets from a single base timestamp. Without that
+    setting they all are the current time.
+    """
+    date_range = datetime_range()
+    if date_range is None:
+        return [now()] * count
+    start, span = date_range
+    return [start + timedelta(microseconds=randrange(span)) for _ in range(count)]
 
 
 def gen_time():
-    return now().time()
+    return gen_datetime().time()
+
+
+def _gen_unique_offsets(start, unit):
+    return (start + n * unit for n in itertools.count(randint(0, MAX_INT)))
+
+
+gen_date.unique = lambda: _gen_unique_offsets(gen_date(), timedelta(days=1))
+gen_datetime.unique = lambda: _gen_unique_offsets(gen_datetime(), timedelta(seconds=1))
+gen_time.unique = lambda: (
+    (datetime.min + timedelta(microseconds=n)).time()
+    for n in gen_permutation(24 * 60 * 60 * 10 ** 6)
+)
 
 
 def gen_string(max_length):
@@ -105,6 +303,7 @@ def gen_string(max_length):
 
 
 gen_string.required = ['max_length']
+gen_string.unique = lambda max_length: _gen_unique_strings(string.ascii_letters, max_length)
 
 
 def gen_slug(max_length):
@@ -113,6 +312,9 @@ def gen_slug(max_length):
 
 
 gen_slug.required = ['max_length']
+gen_slug.unique = lambda max_length: _gen_unique_strings(
+    string.ascii_letters + string.digits + '_-', max_length
+)
 
 
 def gen_text():
@@ -123,6 +325,9 @@ def gen_boolean():
     return choice((True, False))
 
 
+gen_boolean.unique = lambda: iter(sorted((True, False), key=lambda _: random()))
+
+
 def gen_null_boolean():
     return choice((True, False, None))
 
@@ -191,16 +396,42 @@ def gen_interval(interval_key='milliseconds'):
     return timedelta(**kwargs)
 
 
+# database alias -> ContentType manager cache filled by _prefetch_content_types
+_prefetched_content_types = {}
+
+
+def _prefetch_content_types(models):
+    """
+    Loads the ContentTypes of all `models` with a single query the first
+    time, and again after ContentType.objects.clear_cache().
+    """
+    from django.contrib.contenttypes.models import ContentType
+    manager = ContentType.objects
+    cache = getattr(manager, '_cache', {}).get(manager.db)
+    if cache is None or _prefetched_content_types.get(manager.db) is not cache:
+        manager.get_for_models(*models)
+        _prefetched_content_types[manager.db] = manager._cache.get(manager.db)
+
+
 def gen_content_type():
     from django.contrib.contenttypes.models import ContentType
     from django.apps import apps
+    models = apps.get_models()
     try:
-        return ContentType.objects.get_for_model(choice(apps.get_models()))
+        _prefetch_content_types(models)
+        return ContentType.objects.get_for_model(choice(models))
     except AssertionError:
         warnings.warn('Database access disabled, returning ContentType raw instance')
         return ContentType()
 
 
+def gen_content_types(count):
+    """
+    Returns a list of `count` random ContentTypes, with at most one query.
+    """
+    return [gen_content_type() for _ in range(count)]
+
+
 def gen_uuid():
     import uuid
     return uuid.uuid4()
@@ -1,13 +1,50 @@
 import inspect
 import itertools
+from collections import namedtuple
+
+from django.db.models.fields.related import ReverseManyToOneDescriptor
 from . import mommy
-from .exceptions import RecipeNotFound
+from .exceptions import InvalidQuantityException, RecipeNotFound
 
 # Enable seq to be imported from recipes
 from .utils import seq  # NoQA
 
 
-finder = mommy.ModelFinder()
+finder = mommy.finder
+
+
+RecipePlan = namedtuple('RecipePlan', ['static', 'iterators', 'foreign_keys', 'related'])
+RecipePlan.__doc__ = """
+Recipe attributes sorted by how they are handled on each make/prepare:
+values passed straight to mommy (callables included), iterators, foreign
+key recipes (mapped to their `key__` prefix) and related recipes.
+"""
+
+
+def _compile_plan(attrs, base=None):
+    if base is None:
+        base = RecipePlan({}, {}, {}, {})
+    static, iterators, foreign_keys, related_recipes = (dict(slot) for slot in base)
+    for k, v in attrs.items():
+        for slot in (static, iterators, foreign_keys, related_recipes):
+            slot.pop(k, None)
+        if mommy.is_iterator(v):
+            iterators[k] = v
+        elif isinstance(v, RecipeForeignKey):
+            foreign_keys[k] = (v, k + '__')
+        elif isinstance(v, related):
+            related_recipes[k] = v
+        else:
+            static[k] = v
+    return RecipePlan(static, iterators, foreign_keys, related_recipes)
+
+
+def _related_options(attrs):
+    # objects made for the instance go to the same database
+    using = (attrs.get('_save_kwargs') or {}).get('using')
+    if using is None:
+        return {}
+    return {'_save_kwargs': {'using': using}}
 
 
 class Recipe(object):
@@ -16,54 +53,121 @@ class Recipe(object):
         self._model = _model
         # _iterator_backups will hold values of the form (backup_iterator, usable_iterator).
         self._iterator_backups = {}
+        self._plan = None
+
+    @property
+    def plan(self):
+        """
+        The RecipePlan of this recipe, compiled on first use.
+        """
+        if self._plan is None:
+            self._plan = _compile_plan(self.attr_mapping)
+        return self._plan
 
-    def _mapping(self, new_attrs):
+    def _reverse_foreign_key(self, name):
+        """
+        Returns the foreign key behind a reverse relation of the recipe
+        model named `name`, or None for any other attribute.
+        """
+        model = finder.get_model(self._model) if isinstance(self._model, str) else self._model
+        descriptor = getattr(model, name, None)
+        if isinstance(descriptor, ReverseManyToOneDescriptor) and \
+                not descriptor.rel.many_to_many:
+            return descriptor.rel.field
+        return None
+
+    def _mapping(self, new_attrs, deferred=()):
+        plan = self.plan
         _save_related = new_attrs.get('_save_related', True)
         rel_fields_attrs = dict((k, v) for k, v in new_attrs.items() if '__' in k)
         new_attrs = dict((k, v) for k, v in new_attrs.items() if '__' not in k)
-        mapping = self.attr_mapping.copy()
-        for k, v in self.attr_mapping.items():
+        mapping = plan.static.copy()
+        for k, v in plan.iterators.items():
             # do not generate values if field value is provided
             if new_attrs.get(k):
                 continue
-            elif mommy.is_iterator(v):
-                if isinstance(self._model, str):
-                    m = finder.get_model(self._model)
-                else:
-                    m = self._model
-                if k not in self._iterator_backups or m.objects.count() == 0:
+            if isinstance(self._model, str):
+                m = finder.get_model(self._model)
+            else:
+                m = self._model
+            reset = k not in self._iterator_backups or m.objects.count() == 0
+            with mommy._iterator_lock:
+                if reset:
                     self._iterator_backups[k] = itertools.tee(
                         self._iterator_backups.get(k, [v])[0]
                     )
                 mapping[k] = self._iterator_backups[k][1]
-            elif isinstance(v, RecipeForeignKey):
-                a = {}
-                for key, value in list(rel_fields_attrs.items()):
-                    if key.startswith('%s__' % k):
+        options = _related_options(new_attrs)
+        for k, (v, prefix) in plan.foreign_keys.items():
+            if new_attrs.get(k):
+                continue
+            a = {}
+            if rel_fields_attrs:
+                for key in list(rel_fields_attrs):
+                    if key.startswith(prefix):
                         a[key] = rel_fields_attrs.pop(key)
-                recipe_attrs = mommy.filter_rel_attrs(k, **a)
-                if _save_related:
-                    mapping[k] = v.recipe.make(**recipe_attrs)
-                else:
-                    mapping[k] = v.recipe.prepare(**recipe_attrs)
-            elif isinstance(v, related):
-                mapping[k] = v.make()
+            recipe_attrs = mommy.filter_rel_attrs(k, **a)
+            if _save_related:
+                mapping[k] = v.recipe.make(**dict(recipe_attrs, **options))
+            else:
+                mapping[k] = v.recipe.prepare(**recipe_attrs)
+        for k, v in plan.related.items():
+            if k not in new_attrs and k not in deferred:
+                mapping[k] = v.make(**options)
         mapping.update(new_attrs)
         mapping.update(rel_fields_attrs)
         return mapping
 
     def make(self, **attrs):
-        return mommy.make(self._model, **self._mapping(attrs))
+        if not attrs.pop('_signals', True):
+            with mommy.signals_disabled():
+                return self.make(**attrs)
+
+        if attrs.get('_using') is not None:
+            # foreign key and related recipes are made on the first
+            # database too, and copied with the rest
+            using = attrs.pop('_using')
+            parallel = attrs.pop('_parallel', False)
+            save_kwargs = attrs.pop('_save_kwargs', None) or {}
+            return mommy._make_on_databases(
+                using, parallel, save_kwargs,
+                lambda save_kwargs: self.make(_save_kwargs=save_kwargs, **attrs)
+            )
+
+        # reverse foreign keys are created after their parents, already
+        # pointing to them, instead of being created and then updated
+        deferred = {}
+        for k, v in self.plan.related.items():
+            if k not in attrs:
+                field = self._reverse_foreign_key(k)
+                if field is not None:
+                    deferred[k] = (v, field)
+
+        instances = mommy.make(self._model, **self._mapping(attrs, deferred))
+        if deferred:
+            options = _related_options(attrs)
+            for instance in instances if isinstance(instances, list) else [instances]:
+                for v, field in deferred.values():
+                    v.make_for(instance, field, **options)
+        return instances
 
     def prepare(self, **attrs):
         defaults = {'_save_related': False}
         defaults.update(attrs)
         return mommy.prepare(self._model, **self._mapping(defaults))
 
+    def template(self, **attrs):
+        defaults = {'_save_related': False}
+        defaults.update(attrs)
+        return mommy.prepare_template(self._model, **self._mapping(defaults))
+
     def extend(self, **attrs):
         attr_mapping = self.attr_mapping.copy()
         attr_mapping.update(attrs)
-        return type(self)(self._model, **attr_mapping)
+        recipe = type(self)(self._model, **attr_mapping)
+        # only the new attributes need to be sorted out
+        recipe._plan = _compile_plan(attrs, base=self.plan)
+        return recipe
 
 
 class RecipeForeignKey(object):
@@ -92,7 +196,10 @@ def foreign_key(recipe):
 
 
 class related(object):
-    def __init__(self, *args):
+    def __init__(self, *args, count=1):
+        if mommy._valid_quantity(count):
+            raise InvalidQuantityException
+        self.count = count
         self.related = []
         for recipe in args:
             if isinstance(recipe, Recipe):
@@ -108,8 +215,27 @@ class related(object):
             else:
                 raise TypeError('Not a recipe')
 
-    def make(self):
+    def make(self, **attrs):
         """
          Persists objects to m2m relation
         """
-        return [m.make() for m in self.related]
+        return [m.make(**attrs) for m in self.related for _ in range(self.count)]
+
+    def make_for(self, instance, field, **options):
+        """
+         Persists objects of a reverse foreign key relation pointing to
+         an already saved instance, with one bulk insert when possible
+        """
+        attrs = {field.name: instance}
+        bulk = []
+        created = []
+        for recipe in self.related:
+            # m2m values, children relations and the related objects of
+            # another database are only handled by make
+            if options or not mommy._can_bulk_create(field, [itertools.chain(*recipe.plan)]):
+                created.extend(recipe.make(_quantity=self.count, **dict(attrs, **options)))
+            else:
+                bulk.extend(recipe.prepare(_quantity=self.count, _save_related=True, **attrs))
+        if bulk:
+            field.model._base_manager.using(instance._state.db).bulk_create(bulk)
+        return created + bulk
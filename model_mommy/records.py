@@ -0,0 +1,85 @@
+"""
+Support for `mommy.prepare_records`.
+
+Records hold the values of one row in `__slots__` named after the concrete
+field attnames of their model, foreign keys being held as the value they
+point to. They take a fraction of the memory of model instances, which
+carry a `__dict__`, a `ModelState` and cached related objects, and are
+turned into unsaved instances, e.g. for `bulk_create`, with
+`to_instances`.
+"""
+import threading
+
+_record_classes = {}
+_record_classes_lock = threading.Lock()
+
+
+class Record(object):
+    """
+    Base class of the record classes, see `record_class`.
+    """
+    __slots__ = ()
+    _model = None
+    _fields = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self._fields):
+            raise TypeError(
+                '%s takes %d values, not %d'
+                % (type(self).__name__, len(self._fields), len(values))
+            )
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+
+    def __iter__(self):
+        for name in self._fields:
+            yield getattr(self, name)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ', '.join('%s=%r' % (name, value) for name, value in zip(self._fields, self))
+        return '%s(%s)' % (type(self).__name__, values)
+
+    def to_instance(self):
+        """
+        Returns an unsaved instance of the model with the record values.
+        """
+        # positional arguments are the quickest way through Model.__init__
+        return self._model(*self)
+
+
+def record_class(model):
+    """
+    Returns the record class of `model`, building it on first use.
+    """
+    try:
+        return _record_classes[model]
+    except KeyError:
+        pass
+
+    fields = tuple(f.attname for f in model._meta.concrete_fields)
+    attrs = {
+        '__module__': model.__module__,
+        '__qualname__': model.__qualname__ + 'Record',
+        '__slots__': fields,
+        '_model': model,
+        '_fields': fields,
+    }
+    with _record_classes_lock:
+        if model not in _record_classes:
+            _record_classes[model] = type(model.__name__ + 'Record', (Record,), attrs)
+    return _record_classes[model]
+
+
+def to_instances(records):
+    """
+    Returns unsaved model instances with the values of `records`.
+    """
+    return [record.to_instance() for record in records]
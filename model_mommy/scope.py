@@ -0,0 +1,178 @@
+"""
+Support for `mommy.fixture_scope`.
+
+A scope runs its setup once and records every row model_mommy creates
+meanwhile. Each later use opens a savepoint that is rolled back on exit, and
+puts the recorded rows back with one insert per table if they are gone,
+e.g. because the test transaction around the first use was rolled back.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .utils import delete_cached_value
+
+_local = threading.local()
+
+
+def recording():
+    return bool(getattr(_local, 'recorders', None))
+
+
+def record(*instances):
+    """
+    Called by mommy with the instances it saves.
+    """
+    recorders = getattr(_local, 'recorders', None)
+    if recorders:
+        for recorder in recorders:
+            recorder.extend(instances)
+
+
+@contextmanager
+def recorded():
+    """
+    Returns a context manager collecting the instances mommy saves inside
+    the block into the list it returns.
+    """
+    created = []
+    recorders = getattr(_local, 'recorders', None)
+    if recorders is None:
+        recorders = _local.recorders = []
+    recorders.append(created)
+    try:
+        yield created
+    finally:
+        recorders.pop()
+
+
+def dump(instances, using):
+    """
+    Reads the rows of those of `instances` saved on `using`, with the rows
+    of their parents under multi-table inheritance and of their automatic
+    m2m tables. Returns them as a dict of model -> unsaved instances.
+    """
+    pks = OrderedDict()
+    seen = set()
+    for instance in instances:
+        if instance._state.db != using or id(instance) in seen:
+            continue
+        seen.add(id(instance))
+        concrete_model = instance._meta.concrete_model
+        models = list(reversed(concrete_model._meta.get_parent_list())) + [concrete_model]
+        for model in models:
+            # under multiple inheritance each parent has its own key
+            pks.setdefault(model, []).append(getattr(instance, model._meta.pk.attname))
+
+    tables = OrderedDict()
+    through_tables = OrderedDict()
+    for model, model_pks in pks.items():
+        manager = model._base_manager.using(using)
+        tables[model] = list(manager.filter(pk__in=model_pks))
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue
+            lookup = '%s__in' % field.m2m_field_name()
+            rows = through._base_manager.using(using).filter(**{lookup: model_pks})
+            through_tables.setdefault(through, []).extend(rows)
+    tables.update(through_tables)
+    return tables
+
+
+def insert(tables, using):
+    """
+    Inserts the rows returned by `dump` into `using`, primary keys
+    included, with one insert per table and batch, and resets the
+    sequences of the tables like `loaddata` does.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        for model, rows in tables.items():
+            # what bulk_create does, minus its multi-table inheritance check
+            fields = model._meta.local_concrete_fields
+            batch_size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+            manager = model._base_manager.using(using)
+            for start in range(0, len(rows), batch_size):
+                manager._insert(
+                    rows[start:start + batch_size], fields=fields, using=using, raw=True
+                )
+        # the next regular insert must not reuse a primary key inserted here
+        statements = connection.ops.sequence_reset_sql(no_style(), list(tables))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+class FixtureScope(object):
+    """
+    Context manager returning the result of `setup`, with the rows it
+    created in the database and their instances as they were at the end of
+    `setup`. Changes made inside the block are undone on exit.
+    """
+
+    def __init__(self, setup, using=DEFAULT_DB_ALIAS):
+        self.setup = setup
+        self.using = using
+        self.objects = None
+        self._tables = None
+        self._values = None
+        self._atomics = []
+
+    def __enter__(self):
+        if self._tables is None:
+            self._run_setup()
+        else:
+            if not self._rows_exist():
+                insert(self._tables, self.using)
+            self._reset_instances()
+        atomic = transaction.atomic(using=self.using)
+        atomic.__enter__()
+        self._atomics.append(atomic)
+        return self.objects
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        atomic = self._atomics.pop()
+        transaction.set_rollback(True, using=self.using)
+        atomic.__exit__(exc_type, exc_value, traceback)
+
+    def _run_setup(self):
+        with recorded() as created:
+            self.objects = self.setup()
+
+        instances = OrderedDict()
+        for instance in created:
+            if instance._state.db == self.using:
+                instances.setdefault(id(instance), instance)
+        self._values = [
+            (instance, dict(
+                (f.attname, instance.__dict__[f.attname])
+                for f in instance._meta.concrete_fields if f.attname in instance.__dict__
+            ))
+            for instance in instances.values()
+        ]
+        self._tables = dump(instances.values(), self.using)
+
+    def _rows_exist(self):
+        for model, rows in self._tables.items():
+            if rows:
+                manager = model._base_manager.using(self.using)
+                return manager.filter(pk=rows[0].pk).exists()
+        return True
+
+    def _reset_instances(self):
+        for instance, values in self._values:
+            instance.__dict__.update(values)
+            instance.__dict__.pop('_prefetched_objects_cache', None)
+            opts = instance._meta
+            for field in opts.concrete_fields:
+                if field.is_relation:
+                    delete_cached_value(field, instance)
+            for field in opts.related_objects:
+                delete_cached_value(field, instance)
+            instance._state.adding = False
+            instance._state.db = self.using
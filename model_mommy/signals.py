@@ -0,0 +1,55 @@
+"""
+Support for `make(..., _signals=False)` and `mommy.signals_disabled()`.
+
+The save and m2m signals get their `send` methods wrapped, once, so they
+return right away while the current thread is inside a `disabled()` block.
+Other threads still dispatch them.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import m2m_changed, post_save, pre_save
+
+MUTED_SIGNALS = (pre_save, post_save, m2m_changed)
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _muted(send):
+    def wrapper(sender, **named):
+        if muted():
+            return []
+        return send(sender, **named)
+    wrapper.__wrapped__ = send
+    return wrapper
+
+
+def _install():
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for signal in MUTED_SIGNALS:
+            signal.send = _muted(signal.send)
+            signal.send_robust = _muted(signal.send_robust)
+        _installed = True
+
+
+def muted():
+    """
+    Tells whether the current thread is inside a `disabled()` block.
+    """
+    return bool(getattr(_local, 'depth', 0))
+
+
+@contextmanager
+def disabled():
+    if not _installed:
+        _install()
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
@@ -1,17 +1,61 @@
 """
 Add support for Django 1.4+ safe datetimes.
 https://docs.djangoproject.com/en/1.4/topics/i18n/timezones/
+
+`settings.USE_TZ` and `settings.MOMMY_DATETIME_RANGE` are read once and
+cached until they change, since these helpers run for every generated value.
 """
-# TODO: the whole file seems to be not needed anymore, since Django has this tooling built-in
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.timezone import utc
+
+_cache = {}
+
+
+def use_tz():
+    try:
+        return _cache['USE_TZ']
+    except KeyError:
+        return _cache.setdefault('USE_TZ', settings.USE_TZ)
+
+
+def datetime_range():
+    """
+    Returns the (start, span) of the `MOMMY_DATETIME_RANGE` setting, span
+    being the number of microseconds in the range, or None if it is not set.
+    """
+    try:
+        return _cache['MOMMY_DATETIME_RANGE']
+    except KeyError:
+        pass
+
+    value = getattr(settings, 'MOMMY_DATETIME_RANGE', None)
+    if value is not None:
+        start, end = [tz_aware(d) if d.tzinfo is None else d for d in value]
+        span = (end - start) // timedelta(microseconds=1)
+        if span <= 0:
+            raise ValueError('MOMMY_DATETIME_RANGE must end after it starts')
+        value = (start, span)
+    return _cache.setdefault('MOMMY_DATETIME_RANGE', value)
+
+
+def clear_cache(setting=None, **kwargs):
+    # the start of MOMMY_DATETIME_RANGE depends on USE_TZ as well
+    if setting in (None, 'USE_TZ'):
+        _cache.clear()
+    else:
+        _cache.pop(setting, None)
+
+
+setting_changed.connect(clear_cache)
 
-from datetime import datetime
 
-try:
-    from django.conf import settings
-    from django.utils.timezone import now, utc
-except ImportError:
-    def now():
-        return datetime.now()
+def now():
+    if use_tz():
+        return datetime.utcnow().replace(tzinfo=utc)
+    return datetime.now()
 
 
 def smart_datetime(*args):
@@ -21,7 +65,7 @@ def smart_datetime(*args):
 
 def tz_aware(d):
     value = d
-    if settings.USE_TZ:
+    if use_tz():
         value = d.replace(tzinfo=utc)
 
     return value
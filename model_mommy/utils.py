@@ -29,25 +29,78 @@ def import_from_str(import_string):
     return getattr(module, field_name)
 
 
-def seq(value, increment_by=1):
-    if type(value) in [datetime.datetime, datetime.date,  datetime.time]:
-        if type(value) is datetime.date:
-            date = datetime.datetime.combine(value, datetime.datetime.now().time())
-        elif type(value) is datetime.time:
-            date = datetime.datetime.combine(datetime.date.today(), value)
+def delete_cached_value(field, instance):
+    """
+    Drops the related object of `field`, a relation or reverse relation,
+    cached on `instance`, if any.
+    """
+    if hasattr(field, 'delete_cached_value'):
+        if field.is_cached(instance):
+            field.delete_cached_value(instance)
+    else:  # Django < 2.0
+        instance.__dict__.pop(field.get_cache_name(), None)
+
+
+class Sequence(object):
+    """
+    Iterator returned by `seq`.
+
+    Each value is computed from the previous one with a single addition;
+    use `take(n)` to get the next `n` values at once.
+    """
+
+    def __init__(self, value, increment_by=1):
+        if type(value) in (datetime.datetime, datetime.date, datetime.time):
+            self._values = _datetime_sequence(value, increment_by)
         else:
-            date = value
-        # convert to epoch time
-        start = (date - datetime.datetime(1970, 1, 1)).total_seconds()
-        increment_by = increment_by.total_seconds()
-        for n in itertools.count(increment_by, increment_by):
-            series_date = tz_aware(datetime.datetime.utcfromtimestamp(start + n))
-            if type(value) is datetime.time:
-                yield series_date.time()
-            elif type(value) is datetime.date:
-                yield series_date.date()
-            else:
-                yield series_date
+            self._values = _number_sequence(value, increment_by)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._values)
+
+    def take(self, n):
+        """
+        Returns a list with the next `n` values of the sequence.
+        """
+        return list(itertools.islice(self._values, n))
+
+
+def _number_sequence(value, increment_by):
+    # strings, and numbers incremented by another type (e.g. seq(10, 1.5)),
+    # need the increment converted to the type of value
+    convert = type(value) if type(increment_by) is not type(value) else None
+    n = increment_by
+    while True:
+        yield value + (convert(n) if convert else n)
+        n = n + increment_by
+
+
+def _datetime_sequence(value, increment_by):
+    if type(value) is datetime.date:
+        date = datetime.datetime.combine(value, datetime.datetime.now().time())
+    elif type(value) is datetime.time:
+        date = datetime.datetime.combine(datetime.date.today(), value)
     else:
-        for n in itertools.count(increment_by, increment_by):
-            yield value + type(value)(n)
+        date = value
+
+    if type(value) is datetime.time:
+        convert = datetime.datetime.time
+    elif type(value) is datetime.date:
+        convert = datetime.datetime.date
+    else:
+        # tz_aware sets a fixed UTC offset, so it can be applied to the start
+        # value once instead of to every value of the sequence
+        convert = None
+        if date.tzinfo is None:
+            date = tz_aware(date)
+
+    while True:
+        date = date + increment_by
+        yield convert(date) if convert else date
+
+
+def seq(value, increment_by=1):
+    return Sequence(value, increment_by)
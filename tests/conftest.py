@@ -32,7 +32,12 @@ def pytest_configure():
             'default': {
                 'ENGINE': db_engine,
                 'NAME': db_name,
-            }
+            },
+            'other': {
+                'ENGINE': db_engine,
+                'NAME': db_name,
+                'TEST': {'NAME': 'test_other' if test_db != 'sqlite' else None},
+            },
         },
         INSTALLED_APPS=installed_apps,
         LANGUAGE_CODE='en',
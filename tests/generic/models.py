@@ -9,6 +9,7 @@ from tempfile import gettempdir
 from model_mommy.gis import MOMMY_GIS
 
 from django.core.files.storage import FileSystemStorage
+from django.core.validators import MinValueValidator, MaxValueValidator
 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericRelation, GenericForeignKey
@@ -180,6 +181,16 @@ class DummyDecimalModel(models.Model):
     decimal_field = models.DecimalField(max_digits=1, decimal_places=0)
 
 
+class DummyDecimalWithValidatorsModel(models.Model):
+    price = models.DecimalField(
+        max_digits=20, decimal_places=4,
+        validators=[MinValueValidator(Decimal('0.5')), MaxValueValidator(Decimal('1.5'))]
+    )
+    discount = models.DecimalField(
+        max_digits=5, decimal_places=2, validators=[MinValueValidator(-100)]
+    )
+
+
 class UnsupportedField(models.Field):
     description = "I'm bad company, mommy doesn't know me"
 
@@ -285,6 +296,27 @@ class DummyUniqueIntegerFieldModel(models.Model):
     value = models.IntegerField(unique=True)
 
 
+class DummyUniqueFieldsModel(models.Model):
+    small_int = models.PositiveSmallIntegerField(unique=True)
+    code = models.CharField(max_length=2, unique=True)
+    slug = models.SlugField(max_length=2, unique=True)
+    day = models.DateField(unique=True)
+    moment = models.DateTimeField(unique=True)
+    amount = models.DecimalField(max_digits=5, decimal_places=2, unique=True)
+
+
+class DummyUniqueBooleanModel(models.Model):
+    flag = models.BooleanField(unique=True)
+
+
+class DummyUniqueTogetherModel(models.Model):
+    letter = models.CharField(max_length=1)
+    flag = models.BooleanField()
+
+    class Meta:
+        unique_together = ('letter', 'flag')
+
+
 class ModelWithNext(models.Model):
     attr = models.CharField(max_length=10)
 
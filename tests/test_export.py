@@ -0,0 +1,53 @@
+import csv
+from decimal import Decimal
+
+import pytest
+
+from model_mommy.export import export_rows
+from tests.generic import models
+
+
+@pytest.mark.django_db
+class TestExportRows():
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / 'dogs.csv'
+        export_rows(models.Dog, path, 5, _chunk_size=2, breed='pug')
+
+        with open(str(path), newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 5
+        assert set(rows[0]) == set(['owner_id', 'breed', 'created', '_order'])
+        assert all(row['breed'] == 'pug' for row in rows)
+        assert models.Person.objects.filter(
+            pk__in=[row['owner_id'] for row in rows]
+        ).count() == 5
+
+    def test_binary_values_are_written_as_hex_in_csv(self, tmp_path):
+        path = tmp_path / 'people.csv'
+        export_rows(models.Person, path, 1, name_hash=b'\x01\x02')
+        with open(str(path), newline='') as f:
+            row = next(csv.DictReader(f))
+        assert row['name_hash'] == '0102'
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            export_rows(models.Dog, tmp_path / 'dogs', 1, _format='xls')
+
+    def test_npz(self, tmp_path):
+        numpy = pytest.importorskip('numpy')
+        path = tmp_path / 'numbers.npz'
+        export_rows(models.DummyDecimalModel, path, 5, _chunk_size=2, decimal_field=Decimal('7'))
+
+        data = numpy.load(str(path))
+        assert list(data['decimal_field']) == ['7'] * 5
+
+    def test_parquet(self, tmp_path):
+        pyarrow = pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+        path = tmp_path / 'numbers.parquet'
+        export_rows(models.DummyNumbersModel, path, 5, _chunk_size=2)
+
+        table = pyarrow.parquet.read_table(str(path))
+        assert table.num_rows == 5
+        assert table.schema.field('float_field').type == pyarrow.float64()
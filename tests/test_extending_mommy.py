@@ -87,6 +87,17 @@ class MommyDuck:
         pass
 
 
+class EchoMommyDuck:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def make(self, **attrs):
+        return attrs
+
+    def prepare(self, **attrs):
+        return attrs
+
+
 class TestCustomizeMommyClassViaSettings:
     def class_to_import_string(self, class_to_convert):
         return '%s.%s' % (self.__module__, class_to_convert.__name__)
@@ -110,3 +121,15 @@ class TestCustomizeMommyClassViaSettings:
     def test_create_succeeds_with_valid_custom_mommy(self, settings, cls):
         settings.MOMMY_CUSTOM_CLASS = self.class_to_import_string(cls)
         assert mommy.Mommy.create(Person).__class__ == cls
+
+    def test_quantity_with_custom_class_not_extending_mommy(self, settings):
+        settings.MOMMY_CUSTOM_CLASS = self.class_to_import_string(EchoMommyDuck)
+        made = mommy.make(Person, _quantity=2, name='John')
+        assert [attrs['name'] for attrs in made] == ['John', 'John']
+        prepared = mommy.prepare(Person, _quantity=2, name='John')
+        assert [attrs['name'] for attrs in prepared] == ['John', 'John']
+
+    def test_generate_rows_needs_a_mommy_subclass(self, settings):
+        settings.MOMMY_CUSTOM_CLASS = self.class_to_import_string(EchoMommyDuck)
+        with pytest.raises(InvalidCustomMommy):
+            mommy.generate_rows(Person, 1)
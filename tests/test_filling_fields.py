@@ -11,9 +11,12 @@ from django.core.files import images, File
 from django.db import connection
 from django.db.models import fields, ImageField, FileField
 
-from model_mommy import mommy
+from model_mommy import mommy, random_gen
+from model_mommy.exceptions import UniqueValuesExhausted
+from model_mommy import gis
 from model_mommy.gis import MOMMY_GIS
 from model_mommy.random_gen import gen_related
+from model_mommy.timezone import tz_aware
 from tests.generic import generators, models
 
 
@@ -134,6 +137,31 @@ class TestDateTimeFieldsFilling():
         assert isinstance(appointment_field, fields.DateTimeField)
         assert isinstance(person.appointment, datetime)
 
+    def test_datetimes_fall_inside_configured_range(self, settings):
+        start, end = datetime(2015, 1, 1), datetime(2015, 1, 2)
+        settings.MOMMY_DATETIME_RANGE = (start, end)
+        start, end = tz_aware(start), tz_aware(end)
+
+        people = mommy.prepare(models.Person, _quantity=20)
+        assert all(start <= person.appointment < end for person in people)
+        assert all(start.date() <= person.birthday <= end.date() for person in people)
+        assert len(set(person.appointment for person in people)) > 1
+
+        values = random_gen.gen_datetimes(20)
+        assert all(start <= value < end for value in values)
+
+    def test_range_follows_timezone_setting(self, settings):
+        settings.MOMMY_DATETIME_RANGE = (datetime(2015, 1, 1), datetime(2015, 1, 2))
+        settings.USE_TZ = True
+        assert random_gen.gen_datetime().tzinfo is not None
+        settings.USE_TZ = False
+        assert random_gen.gen_datetime().tzinfo is None
+
+    def test_invalid_range(self, settings):
+        settings.MOMMY_DATETIME_RANGE = (datetime(2015, 1, 2), datetime(2015, 1, 1))
+        with pytest.raises(ValueError):
+            random_gen.gen_datetime()
+
 
 class TestTimeFieldsFilling():
 
@@ -192,6 +220,36 @@ class TestFillingPositiveIntFields():
         assert dummy_positive_int_model.positive_int_field > 0
 
 
+@pytest.mark.django_db
+class TestFillingUniqueFields():
+
+    def test_unique_values_across_quantity(self):
+        dummies = mommy.make(models.DummyUniqueFieldsModel, _quantity=1000)
+        for name in ['small_int', 'code', 'slug', 'day', 'moment', 'amount']:
+            assert len(set(getattr(d, name) for d in dummies)) == 1000
+
+        field = models.DummyUniqueFieldsModel._meta.get_field('code')
+        assert all(len(d.code) == field.max_length for d in dummies)
+        assert all(0 <= d.small_int <= 10000 for d in dummies)
+
+    def test_raise_when_unique_values_are_exhausted(self):
+        with pytest.raises(UniqueValuesExhausted):
+            mommy.make(models.DummyUniqueBooleanModel, _quantity=3)
+
+    def test_unique_together_values_across_quantity(self):
+        # every one of the 52 letters with both flags
+        dummies = mommy.make(models.DummyUniqueTogetherModel, _quantity=104)
+        assert len(set((d.letter, d.flag) for d in dummies)) == 104
+
+    def test_raise_when_unique_together_values_are_exhausted(self):
+        with pytest.raises(UniqueValuesExhausted):
+            mommy.prepare(models.DummyUniqueTogetherModel, _quantity=105)
+
+    def test_gen_unique_tuples_draws_each_combination_once(self):
+        tuples = list(random_gen.gen_unique_tuples([iter('abc'), iter([True, False])]))
+        assert sorted(tuples) == sorted((c, f) for c in 'abc' for f in (True, False))
+
+
 @pytest.mark.django_db
 class TestFillingOthersNumericFields():
 
@@ -207,6 +265,25 @@ class TestFillingOthersNumericFields():
         assert isinstance(decimal_field, fields.DecimalField)
         assert isinstance(self.dummy_decimal_model.decimal_field, Decimal)
 
+    def test_filling_DecimalField_respects_digits_and_validators(self):
+        dummies = mommy.make(models.DummyDecimalWithValidatorsModel, _quantity=50)
+        for dummy in dummies:
+            dummy.full_clean()
+            assert Decimal('0.5') <= dummy.price <= Decimal('1.5')
+            assert dummy.price.as_tuple().exponent == -4
+
+    def test_decimals_without_integer_part_use_every_digit(self):
+        values = random_gen.gen_decimals(200, max_digits=2, decimal_places=2)
+        assert all(Decimal('0') <= v <= Decimal('0.99') for v in values)
+        assert max(values) > Decimal('0.09')
+        assert len(list(random_gen.gen_unique_decimals(2, 2))) == 100
+
+    def test_gen_decimals_batch(self):
+        values = random_gen.gen_decimals(100, max_digits=4, decimal_places=2)
+        assert len(values) == 100
+        assert all(Decimal('0') <= v < Decimal('10') for v in values)
+        assert all(v.as_tuple().exponent == -2 for v in values)
+
 
 class TestURLFieldsFilling():
 
@@ -251,6 +328,17 @@ class TestFillingGenericForeignKeyField():
         assert isinstance(dummy.content_type, ContentType)
         assert dummy.content_type.model_class() is not None
 
+    def test_content_types_are_fetched_with_one_query(self, django_assert_num_queries):
+        ContentType.objects.clear_cache()
+        with django_assert_num_queries(1):
+            dummies = mommy.prepare(models.DummyGenericForeignKeyModel, _quantity=20)
+        assert all(isinstance(d.content_type, ContentType) for d in dummies)
+
+        ContentType.objects.clear_cache()
+        with django_assert_num_queries(1):
+            content_types = random_gen.gen_content_types(20)
+        assert all(ct.pk for ct in content_types)
+
 
 @pytest.mark.django_db
 class TestsFillingFileField():
@@ -425,3 +513,34 @@ class TestGisFieldsFilling():
 
     def test_fill_GeometryCollectionField_valid(self, person):
         self.assertGeomValid(person.geom_collection)
+
+    @pytest.mark.parametrize('field_name', [
+        'point', 'line_string', 'polygon', 'multi_point', 'multi_line_string',
+        'multi_polygon', 'geom', 'geom_collection',
+    ])
+    def test_fill_with_geos_geometries(self, settings, field_name):
+        settings.MOMMY_GIS_GEOS = True
+        settings.MOMMY_GIS_BBOX = (10, 20, 11, 21)
+        person = mommy.prepare('generic.Person')
+        geom = getattr(person, field_name)
+        self.assertGeomValid(geom)
+        assert geom.srid == models.Person._meta.get_field(field_name).srid
+        xmin, ymin, xmax, ymax = geom.extent
+        assert 10 <= xmin <= xmax <= 11 and 20 <= ymin <= ymax <= 21
+
+    def test_gen_geometries_batch(self):
+        points = gis.gen_geometries('Point', 100, srid=3857)
+        assert len(points) == 100
+        assert all(p.geom_type == 'Point' and p.srid == 3857 for p in points)
+
+
+class TestGisCoordinates():
+
+    def test_gen_coordinates_inside_bbox(self):
+        coords = gis.gen_coordinates(100, bbox=(-10, 5, -9, 6))
+        assert len(coords) == 100
+        assert all(-10 <= x <= -9 and 5 <= y <= 6 for x, y in coords)
+
+    def test_gen_coordinates_bbox_from_settings(self, settings):
+        settings.MOMMY_GIS_BBOX = (100, 100, 101, 101)
+        assert all(100 <= x <= 101 for x, y in gis.gen_coordinates(10))
@@ -1,13 +1,19 @@
 import pytest
+import asyncio
 import datetime
+import itertools
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from unittest.mock import patch
 
-from django.db.models import Manager
-from django.db.models.signals import m2m_changed
+from django.db import connections, transaction
+from django.db.models import Manager, Model
+from django.db.models.signals import m2m_changed, post_save, pre_save
 
 from model_mommy import mommy
 from model_mommy import random_gen
+from model_mommy import records
 from model_mommy.exceptions import ModelNotFound, AmbiguousModelName, InvalidQuantityException
 from model_mommy.timezone import smart_datetime
 
@@ -44,6 +50,24 @@ class TestsModelFinder():
         with pytest.raises(ModelNotFound):
             mommy.Mommy('NonExistingModel')
 
+    def test_app_model_string_is_case_insensitive(self):
+        assert mommy.finder.get_model('Generic.PERSON') is models.Person
+
+    def test_finders_share_the_model_index(self):
+        from model_mommy.recipe import finder
+        assert finder.get_model('Person') is models.Person
+        assert mommy.ModelFinder._models is not None
+        assert mommy.ModelFinder()._get_index() is mommy.ModelFinder._models
+
+    def test_index_is_rebuilt_when_models_are_registered(self):
+        mommy.finder.get_model('Person')
+        assert mommy.ModelFinder._models is not None
+
+        from django.db.models.signals import class_prepared
+        class_prepared.send(sender=models.Person)
+        assert mommy.ModelFinder._models is None
+        assert mommy.finder.get_model('Person') is models.Person
+
 
 @pytest.mark.django_db
 class TestsMommyCreatesSimpleModel():
@@ -123,6 +147,30 @@ class TestsMommyRepeatedCreatesSimpleModel():
         people = mommy.prepare(models.Person, _quantity=5, name="George Washington")
         assert all(p.name == "George Washington" for p in people)
 
+    def test_attributes_are_classified_once_per_call(self):
+        names = iter(['a', 'b', 'c'])
+        with patch.object(mommy.Mommy, '_clean_attrs', autospec=True,
+                          side_effect=mommy.Mommy._clean_attrs) as clean_attrs:
+            people = mommy.make(
+                models.Person, _quantity=3, name=lambda: next(names), nickname='x',
+                happy=itertools.cycle([True, False]),
+            )
+        assert clean_attrs.call_count == 1
+        assert [p.name for p in people] == ['a', 'b', 'c']
+        assert [p.happy for p in people] == [True, False, True]
+        assert all(p.nickname == 'x' for p in people)
+
+        with patch.object(mommy.Mommy, '_clean_attrs', autospec=True,
+                          side_effect=mommy.Mommy._clean_attrs) as clean_attrs:
+            mommy.prepare(models.Person, _quantity=3, _lazy=True)
+        assert clean_attrs.call_count == 1
+
+    def test_make_sets_reverse_relations_of_each_instance(self):
+        stores = mommy.make(models.Store, _quantity=2)
+        people = mommy.make(models.Person, _quantity=2, favorite_stores=stores)
+        for person in people:
+            assert set(person.favorite_stores.all()) == set(stores)
+
     def test_prepare_raises_correct_exception_if_invalid_quantity(self):
         with pytest.raises(InvalidQuantityException):
             mommy.prepare(_model=models.Person, _quantity="hi")
@@ -171,6 +219,222 @@ class TestMommyPrepareSavingRelatedInstances():
         assert lonely_person.only_friend.pk
 
 
+class TestMommyPrepareLazily():
+
+    def test_values_are_generated_on_first_access(self):
+        with patch.object(mommy.Mommy, 'generate_value') as generate_value:
+            generate_value.return_value = 'generated'
+            person = mommy.prepare(models.Person, name='bob', _lazy=True)
+            assert not generate_value.called
+
+            assert person.name == 'bob'
+            assert person.bio == 'generated'
+            assert person.bio == 'generated'
+            assert generate_value.call_count == 1
+
+        assert isinstance(person, models.Person)
+        assert 'bio' not in person.get_deferred_fields()
+        assert 'nickname' in person.get_deferred_fields()
+
+    def test_assigned_values_are_not_generated(self):
+        person = mommy.prepare(models.Person, _lazy=True)
+        person.bio = 'assigned'
+        assert person.bio == 'assigned'
+
+    def test_related_instances_are_prepared_on_access(self):
+        dog = mommy.prepare(models.Dog, _lazy=True)
+        owner = dog.owner
+        assert isinstance(owner, models.Person)
+        assert owner.id is None
+        assert dog.owner is owner
+
+    def test_lazy_prepare_with_quantity(self):
+        people = mommy.prepare(models.Person, _quantity=3, _lazy=True)
+        assert len(set(p.name for p in people)) == 3
+
+    @pytest.mark.django_db
+    def test_save_generates_all_values(self):
+        dog = mommy.prepare(models.Dog, _lazy=True, _save_related=True)
+        dog.save()
+        assert type(dog) is models.Dog
+        assert not dog.get_deferred_fields()
+
+        saved = models.Dog.objects.get()
+        assert saved.breed == dog.breed
+        assert saved.owner == dog.owner
+
+    def test_pickling_generates_all_values(self):
+        person = mommy.prepare(models.Person, name='bob', _lazy=True)
+        unpickled = pickle.loads(pickle.dumps(person))
+        assert type(person) is type(unpickled) is models.Person
+        assert unpickled.name == 'bob'
+        assert unpickled.bio == person.bio
+
+    @pytest.mark.django_db
+    def test_bulk_create_restores_the_model_class(self):
+        people = mommy.prepare(models.Person, _quantity=2, _lazy=True)
+        models.Person.objects.bulk_create(people)
+        assert all(type(person) is models.Person for person in people)
+        assert sorted(models.Person.objects.values_list('name', flat=True)) == sorted(
+            person.name for person in people
+        )
+
+
+class TestMommyPrepareTemplate():
+
+    def test_copies_share_values_but_not_state(self):
+        template = mommy.prepare_template(models.Dog)
+        first, second = template.copies(2)
+        assert first is not second
+        assert first.breed == second.breed == template.instance.breed
+        assert first.owner is not second.owner
+        assert first.owner.name == second.owner.name
+
+        first.breed = 'changed'
+        first.owner.name = 'changed'
+        assert second.breed != 'changed'
+        assert template.instance.owner.name != 'changed'
+
+    def test_unique_and_varying_fields_get_new_values(self):
+        template = mommy.prepare_template(models.DummyUniqueFieldsModel)
+        values = [(d.small_int, d.code, d.slug) for d in template.copies(10)]
+        assert len(set(values)) == 10
+
+        template = mommy.prepare_template(models.Person, _vary=['name'])
+        assert len(set(p.name for p in template.copies(5))) == 5
+        assert len(set(p.bio for p in template.copies(5))) == 1
+
+    def test_iterators_and_callables_are_used_for_each_copy(self):
+        template = mommy.prepare_template(
+            models.Person, name=itertools.cycle(['a', 'b']), bio=lambda: 'bio'
+        )
+        people = template.copies(3)
+        assert [p.name for p in people] == ['a', 'b', 'a']
+        assert all(p.bio == 'bio' for p in people)
+
+    def test_mutable_values_are_not_shared(self):
+        template = mommy.prepare_template(models.BaseModelForList, fk=['foo'])
+        first, second = template.copies(2)
+        first.fk.append('bar')
+        assert second.fk == ['foo']
+        assert template.instance.fk == ['foo']
+
+    def test_invalid_vary_field(self):
+        with pytest.raises(AttributeError):
+            mommy.prepare_template(models.Person, _vary=['unknown'])
+
+    @pytest.mark.django_db
+    def test_copies_can_be_saved(self):
+        template = mommy.prepare_template(models.Dog, _save_related=True)
+        for dog in template.copies(3):
+            dog.save()
+        assert models.Dog.objects.count() == 3
+        assert models.Person.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestMommyGenerateRows():
+
+    def test_rows_are_keyed_by_column(self):
+        rows = mommy.generate_rows(models.Dog, 3, breed='pug')
+        assert rows.columns == ('owner_id', 'breed', 'created', '_order')
+        rows = [dict(zip(rows.columns, row)) for row in rows]
+        assert len(rows) == 3
+        assert all(row['breed'] == 'pug' for row in rows)
+        owners = models.Person.objects.in_bulk([row['owner_id'] for row in rows])
+        assert len(owners) == 3
+
+    def test_no_model_instance_is_created(self):
+        with patch.object(models.Person, '__init__') as init:
+            rows = list(mommy.generate_rows(models.Person, 2))
+        assert not init.called
+        assert len(rows) == 2
+
+    def test_columnar(self):
+        columns = mommy.generate_rows(
+            models.Dog, 3, _columnar=True,
+            owner=mommy.make(models.Person), breed=itertools.cycle(['a', 'b'])
+        )
+        assert list(columns) == ['owner_id', 'breed', 'created', '_order']
+        assert columns['breed'] == ['a', 'b', 'a']
+        assert len(set(columns['owner_id'])) == 1
+
+    def test_skipped_fields_get_their_default(self):
+        columns = mommy.generate_rows(models.DummyDefaultFieldsModel, 1, _columnar=True)
+        assert columns['default_char_field'] == ['default']
+        assert 'default_id' not in columns
+
+    def test_unique_values_are_not_repeated(self):
+        columns = mommy.generate_rows(models.DummyUniqueFieldsModel, 20, _columnar=True)
+        assert len(set(columns['code'])) == 20
+
+    def test_rows_can_be_bulk_created(self):
+        rows = mommy.generate_rows(models.DummyNumbersModel, 5)
+        models.DummyNumbersModel.objects.bulk_create(
+            models.DummyNumbersModel(**dict(zip(rows.columns, row))) for row in rows
+        )
+        assert models.DummyNumbersModel.objects.count() == 5
+
+    def test_invalid_quantity(self):
+        with pytest.raises(InvalidQuantityException):
+            mommy.generate_rows(models.Dog, 0)
+
+
+@pytest.mark.django_db
+class TestMommyPrepareRecords():
+
+    def test_records_hold_the_concrete_field_values(self):
+        owner = mommy.make(models.Person)
+        dogs = mommy.prepare_records(models.Dog, 3, owner=owner, breed=itertools.cycle(['a', 'b']))
+        assert len(dogs) == 3
+        assert type(dogs[0])._fields == ('id', 'owner_id', 'breed', 'created', '_order')
+        assert [dog.breed for dog in dogs] == ['a', 'b', 'a']
+        assert all(dog.owner_id == owner.pk and dog.id is None for dog in dogs)
+        assert not hasattr(dogs[0], '__dict__')
+
+    def test_no_model_instance_is_created(self):
+        with patch.object(models.Person, '__init__') as init:
+            people = mommy.prepare_records(models.Person, 2, name='John')
+        assert not init.called
+        assert people[0].name == 'John'
+
+    def test_records_compare_by_value(self):
+        first, second = mommy.prepare_records(models.DummyDefaultFieldsModel, 2)
+        assert first == second
+        first.default_char_field = 'changed'
+        assert first != second
+        assert 'default_char_field=' in repr(first)
+
+    def test_records_to_instances(self):
+        records_ = mommy.prepare_records(models.PaymentBill, 2, _save_related=True, value=1.5)
+        bills = records.to_instances(records_)
+        assert all(isinstance(bill, models.PaymentBill) and bill._state.adding for bill in bills)
+        models.PaymentBill.objects.bulk_create(bills)
+        assert models.PaymentBill.objects.filter(value=1.5).count() == 2
+        assert set(models.PaymentBill.objects.values_list('user_id', flat=True)) == set(
+            record.user_id for record in records_
+        )
+
+    def test_related_objects_are_not_created_by_default(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            dogs = mommy.prepare_records(models.Dog, 2)
+        assert [dog.owner_id for dog in dogs] == [None, None]
+        owner = mommy.make(models.Person)
+        dogs = mommy.prepare_records(models.Dog, 2, owner=owner)
+        assert [dog.owner_id for dog in dogs] == [owner.pk, owner.pk]
+
+    def test_record_class_is_built_once(self):
+        assert records.record_class(models.Person) is records.record_class(models.Person)
+        with pytest.raises(TypeError):
+            records.record_class(models.Person)('too few')
+
+    def test_raises_if_invalid_quantity(self):
+        with pytest.raises(InvalidQuantityException):
+            mommy.prepare_records(models.Person, None)
+        with pytest.raises(InvalidQuantityException):
+            mommy.prepare_records(models.Person, 0)
+
+
 @pytest.mark.django_db
 class TestMommyCreatesAssociatedModels():
 
@@ -379,6 +643,16 @@ class TestMommyCreatesAssociatedModels():
 
         assert person.dog_set.count() == 2
 
+    def test_deeply_nested_field_lookup(self):
+        bill = mommy.make(models.PaymentBill, user__profile__email='a@example.com', value=1)
+        assert bill.user.profile.email == 'a@example.com'
+
+    def test_related_attributes_only_reach_their_field(self):
+        with patch('model_mommy.mommy.make', wraps=mommy.make) as make:
+            mommy.make(models.Person, dog_set__breed='pug', one_related__name='Foo')
+        dog_kwargs = [c[1] for c in make.call_args_list if c[1].get('_model') is models.Dog]
+        assert dog_kwargs and 'one_related__name' not in dog_kwargs[0]
+
     def test_field_lookup_for_related_field(self):
         person = mommy.make(
             models.Person,
@@ -505,6 +779,11 @@ class TestFillBlanksTestCase():
         with pytest.raises(TypeError):
             mommy.make(models.DummyBlankFieldsModel, _fill_optional=1)
 
+    def test_fill_optional_does_not_change_model_fields(self):
+        mommy.make(models.DummyBlankFieldsModel, _fill_optional=True)
+        for field in models.DummyBlankFieldsModel._meta.fields:
+            assert not hasattr(field, 'fill_optional')
+
 
 @pytest.mark.django_db
 class TestFillAutoFieldsTestCase():
@@ -613,6 +892,111 @@ class TestMommyAutomaticallyRefreshFromDB():
         assert person.birthday == '2017-02-01'
         assert person.birthday != datetime.date(2017, 2, 1)
 
+    def test_batch_is_refreshed_with_one_query(self, django_assert_num_queries):
+        people = mommy.make(models.Person, _quantity=5, birthday='2017-02-01')
+        with django_assert_num_queries(1):
+            mommy._refresh_from_db(people)
+        assert all(p.birthday == datetime.date(2017, 2, 1) for p in people)
+
+    def test_refresh_batch_on_make(self, django_assert_num_queries):
+        # one insert per person, one select for all of them
+        with django_assert_num_queries(4):
+            people = mommy.make(
+                models.Person, _quantity=3, birthday='2017-02-01', _refresh_after_create=True
+            )
+        assert [p.birthday for p in people] == [datetime.date(2017, 2, 1)] * 3
+
+    def test_refresh_clears_cached_relations(self):
+        dogs = mommy.make(models.Dog, _quantity=2)
+        owner = mommy.make(models.Person)
+        models.Dog.objects.update(owner=owner)
+        mommy._refresh_from_db(dogs)
+        assert all(dog.owner == owner for dog in dogs)
+
+
+class TestParseRelAttrs():
+
+    def test_attributes_are_grouped_by_field(self):
+        tree = mommy.parse_rel_attrs({
+            'owner__name': 'Bob', 'owner__home__city': 'X', 'dog_set__breed': 'pug'
+        })
+        assert tree == {
+            'owner': {'name': 'Bob', 'home__city': 'X'},
+            'dog_set': {'breed': 'pug'},
+        }
+
+    def test_filter_rel_attrs(self):
+        attrs = mommy.filter_rel_attrs('owner', owner__home__city='X', other='Y')
+        assert attrs == {'home__city': 'X', 'other': 'Y'}
+
+
+@pytest.mark.django_db
+class TestMommyCreatesReverseRelationsInBulk():
+
+    def test_children_of_a_batch_are_bulk_created(self, django_assert_num_queries):
+        person = mommy.make(models.Person)
+        # one insert per movie, one for all the cast members
+        with django_assert_num_queries(6):
+            movies = mommy.make(
+                models.Movie, _quantity=5, cast_members__person=person
+            )
+        for movie in movies:
+            assert list(movie.cast_members.values_list('person', flat=True)) == [person.pk]
+
+    def test_several_children_per_parent(self):
+        movies = mommy.make(models.Movie, _quantity=2, cast_members___quantity=3)
+        assert [m.cast_members.count() for m in movies] == [3, 3]
+        movie = mommy.make(models.Movie, cast_members___quantity=2)
+        assert movie.cast_members.count() == 2
+
+    def test_children_needing_save_are_made_one_by_one(self):
+        people = mommy.make(models.Person, _quantity=2, dog_set__breed='pug')
+        assert [p.dog_set.get().breed for p in people] == ['pug', 'pug']
+
+    def test_invalid_children_quantity(self):
+        with pytest.raises(InvalidQuantityException):
+            mommy.make(models.Movie, cast_members___quantity=0)
+
+    def test_children_with_save_receivers_are_made_one_by_one(self):
+        saved = []
+
+        def receiver(sender, instance, **kwargs):
+            saved.append(instance)
+
+        post_save.connect(receiver, sender=models.CastMember)
+        try:
+            movie = mommy.make(models.Movie, cast_members___quantity=2)
+        finally:
+            post_save.disconnect(receiver, sender=models.CastMember)
+        assert saved == list(movie.cast_members.all())
+
+    def test_children_overriding_save_are_made_one_by_one(self, monkeypatch):
+        saved = []
+
+        def save(self, *args, **kwargs):
+            saved.append(self)
+            return Model.save(self, *args, **kwargs)
+
+        monkeypatch.setattr(models.CastMember, 'save', save)
+        movie = mommy.make(models.Movie, cast_members___quantity=2)
+        assert saved == list(movie.cast_members.all())
+
+    def test_children_are_bulk_created_without_signals(self, django_assert_num_queries):
+        def receiver(sender, instance, **kwargs):
+            pass
+
+        person = mommy.make(models.Person)
+        post_save.connect(receiver, sender=models.CastMember)
+        try:
+            # one insert for the movie, one for all the cast members
+            with django_assert_num_queries(2):
+                mommy.make(
+                    models.Movie, _signals=False, cast_members___quantity=2,
+                    cast_members__person=person
+                )
+        finally:
+            post_save.disconnect(receiver, sender=models.CastMember)
+
 
 @pytest.mark.django_db
 class TestMommyMakeCanFetchInstanceFromDefaultManager():
@@ -637,3 +1021,314 @@ class TestMommyMakeCanFetchInstanceFromDefaultManager():
             _from_manager='objects',
         )
         assert movie.title == movie.name
+
+    def test_batch_is_fetched_with_one_query(self, django_assert_num_queries):
+        titles = ['a', 'b', 'c']
+        # an insert per movie and its parent, then one select
+        with django_assert_num_queries(7):
+            movies = mommy.make(
+                models.MovieWithAnnotation,
+                title=iter(titles),
+                _quantity=3,
+                _from_manager='objects',
+            )
+        assert [m.name for m in movies] == titles
+
+
+class TestMommyIsThreadSafe():
+
+    def test_shared_mommy_keeps_attrs_of_each_call(self):
+        person_mommy = mommy.Mommy(models.Person)
+
+        def prepare_person(i):
+            return i, person_mommy.prepare(name=str(i), _fill_optional=['nickname'])
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(prepare_person, range(2000)))
+
+        for i, person in results:
+            assert person.name == str(i)
+            assert person.nickname
+
+    def test_shared_iterator_is_consumed_once_per_instance(self):
+        names = (str(i) for i in itertools.count())
+
+        def prepare_person(_):
+            return mommy.prepare(models.Person, name=names).name
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            prepared = list(executor.map(prepare_person, range(2000)))
+
+        assert sorted(prepared, key=int) == [str(i) for i in range(2000)]
+
+    def test_model_finder_is_populated_once_between_threads(self):
+        finder = mommy.ModelFinder()
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            found = list(executor.map(finder.get_model, ['Person'] * 500))
+
+        assert set(found) == {models.Person}
+
+
+def run_async(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestMommyAsyncAPI():
+
+    def test_aprepare_does_not_persist(self):
+        person = run_async(mommy.aprepare(models.Person, name='bob'))
+        assert isinstance(person, models.Person)
+        assert person.name == 'bob'
+        assert person.id is None
+
+    def test_aprepare_respects_quantity(self):
+        people = run_async(mommy.aprepare(models.Person, _quantity=3))
+        assert len(people) == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_amake_instances_concurrently(self):
+        async def make_all():
+            return await asyncio.gather(*[
+                mommy.amake(models.Dog, breed=str(i)) for i in range(10)
+            ])
+
+        dogs = run_async(make_all())
+        assert [d.breed for d in dogs] == [str(i) for i in range(10)]
+        assert models.Dog.objects.count() == 10
+        assert models.Person.objects.count() == 10
+
+    @pytest.mark.django_db(transaction=True)
+    def test_amake_recipe(self):
+        dogs = run_async(mommy.amake_recipe('tests.generic.dog', _quantity=2))
+        assert models.Dog.objects.filter(pk__in=[d.pk for d in dogs]).count() == 2
+
+
+@pytest.mark.django_db(databases=['default', 'other'])
+class TestMommyMakeOnSeveralDatabases():
+
+    def test_make_using_single_database(self):
+        dog = mommy.make(models.Dog, _using='other')
+        assert not models.Dog.objects.exists()
+        assert models.Dog.objects.using('other').get().pk == dog.pk
+        assert models.Person.objects.using('other').get().pk == dog.owner_id
+
+    def test_values_are_generated_once_for_all_databases(self):
+        dogs = mommy.make(models.Dog, _quantity=3, _using=['default', 'other'])
+
+        for alias in ['default', 'other']:
+            rows = list(
+                models.Dog.objects.using(alias).order_by('pk').values_list(
+                    'pk', 'breed', 'owner_id', 'owner__name'
+                )
+            )
+            assert rows == [(d.pk, d.breed, d.owner_id, d.owner.name) for d in dogs]
+
+        assert all(d._state.db == 'default' for d in dogs)
+
+    def test_make_using_with_multi_table_inheritance(self):
+        instance = mommy.make(models.DummyMultipleInheritanceModel, _using=['default', 'other'])
+        other = models.DummyMultipleInheritanceModel.objects.using('other').get()
+        assert other.pk == instance.pk
+        assert other.default_id == instance.default_id
+
+    def test_m2m_values_are_created_and_copied(self):
+        store = mommy.make(models.Store, make_m2m=True, _using=['default', 'other'])
+        for alias in ['default', 'other']:
+            customers = models.Store.objects.using(alias).get().customers.all()
+            assert sorted(c.pk for c in customers) == sorted(c.pk for c in store.customers.all())
+            assert len(customers) == mommy.MAX_MANY_QUANTITY
+
+    def test_m2m_values_are_saved_on_the_first_database(self):
+        customers = mommy.prepare(models.Person, _quantity=2)
+        mommy.make(models.Store, customers=customers, _using='other')
+        assert not models.Person.objects.exists()
+        assert models.Store.objects.using('other').get().customers.count() == 2
+
+    def test_reverse_relations_are_created_and_copied(self):
+        person = mommy.make(
+            models.Person, dog_set__breed='pug', dog_set___quantity=2, _using=['default', 'other']
+        )
+        for alias in ['default', 'other']:
+            dogs = models.Dog.objects.using(alias).filter(owner_id=person.pk)
+            assert [d.breed for d in dogs] == ['pug', 'pug']
+
+    def test_recipe_foreign_keys_are_made_and_copied(self):
+        dog = mommy.make_recipe('tests.generic.dog', _using=['default', 'other'])
+        for alias in ['default', 'other']:
+            copy = models.Dog.objects.using(alias).select_related('owner').get()
+            assert copy.owner.pk == dog.owner.pk
+            assert copy.owner.name == 'John Doe'
+
+    def test_recipe_foreign_keys_go_to_the_first_database(self):
+        dog = mommy.make_recipe('tests.generic.dog', _using='other')
+        assert not models.Person.objects.exists()
+        assert models.Person.objects.using('other').get().pk == dog.owner_id
+
+    def test_recipe_related_objects_are_made_and_copied(self):
+        movie = mommy.make_recipe('tests.generic.movie_with_cast', _using=['default', 'other'])
+        for alias in ['default', 'other']:
+            cast = models.CastMember.objects.using(alias).filter(movie_id=movie.pk)
+            assert cast.count() == 2
+
+        lady = mommy.make_recipe('tests.generic.dog_lady', _using=['default', 'other'])
+        for alias in ['default', 'other']:
+            assert models.Dog.objects.using(alias).filter(owner_id=lady.pk).count() == 2
+
+    def test_sequences_are_reset_after_copying(self):
+        ops = connections['other'].ops
+        with patch.object(ops, 'sequence_reset_sql', return_value=[]) as sequence_reset_sql:
+            mommy.make(models.Dog, _using=['default', 'other'])
+        models_ = sequence_reset_sql.call_args[0][1]
+        assert models.Dog in models_ and models.Person in models_
+        mommy.make(models.Dog, _using='other')
+        assert models.Dog.objects.using('other').count() == 2
+
+    def test_invalid_using(self):
+        with pytest.raises(ValueError):
+            mommy.make(models.Person, _using=[])
+        with pytest.raises(TypeError):
+            mommy.make(models.Person, _using='other', _save_kwargs={'using': 'default'})
+
+    def test_from_manager(self):
+        movie = mommy.make(models.MovieWithAnnotation, _using='other', _from_manager='objects')
+        assert movie.name == movie.title
+        assert movie._state.db == 'other'
+
+
+@pytest.mark.django_db(databases=['default', 'other'], transaction=True)
+class TestMommyMakeOnSeveralDatabasesInParallel():
+
+    def test_parallel_writes(self):
+        people = mommy.make(
+            models.Person, _quantity=5, _using=['default', 'other'], _parallel=True
+        )
+        pks = sorted(p.pk for p in people)
+        assert sorted(models.Person.objects.values_list('pk', flat=True)) == pks
+        assert sorted(models.Person.objects.using('other').values_list('pk', flat=True)) == pks
+
+
+@pytest.mark.django_db
+class TestMommyFixtureScope():
+
+    def test_setup_runs_once_and_rows_come_back(self):
+        calls = []
+
+        def setup():
+            calls.append(1)
+            return mommy.make(models.Dog, _quantity=2)
+
+        fixture = mommy.fixture_scope(setup)
+        with transaction.atomic():
+            with fixture as dogs:
+                assert models.Dog.objects.count() == 2
+            transaction.set_rollback(True)
+        assert not models.Dog.objects.exists()
+
+        with fixture as restored:
+            assert restored is dogs
+            assert sorted(models.Dog.objects.values_list('pk', 'breed', 'owner_id')) == sorted(
+                (d.pk, d.breed, d.owner_id) for d in dogs
+            )
+            assert models.Person.objects.count() == 2
+        assert calls == [1]
+
+    def test_changes_inside_the_block_are_undone(self):
+        fixture = mommy.fixture_scope(lambda: mommy.make(models.Person, name='John'))
+        with fixture as person:
+            person.name = 'Mary'
+            person.save()
+            mommy.make(models.Person)
+            assert models.Person.objects.count() == 2
+
+        assert list(models.Person.objects.values_list('name', flat=True)) == ['John']
+        with fixture as person:
+            assert person.name == 'John'
+
+    def test_cached_related_objects_are_dropped(self):
+        fixture = mommy.fixture_scope(lambda: mommy.make(models.Dog, owner__name='John'))
+        with fixture as dog:
+            dog.owner = mommy.make(models.Person, name='Mary')
+
+        with fixture as dog:
+            assert dog.owner.name == 'John'
+
+    def test_restores_inheritance_and_m2m_rows(self):
+        def setup():
+            return (
+                mommy.make(models.DummyMultipleInheritanceModel),
+                mommy.make(models.Classroom, make_m2m=True),
+            )
+
+        fixture = mommy.fixture_scope(setup)
+        with transaction.atomic():
+            with fixture as (child, classroom):
+                students = sorted(classroom.students.values_list('pk', flat=True))
+            transaction.set_rollback(True)
+
+        with fixture as (child, classroom):
+            restored = models.DummyMultipleInheritanceModel.objects.get()
+            assert restored.pk == child.pk
+            assert restored.default_id == child.default_id
+            assert sorted(classroom.students.values_list('pk', flat=True)) == students
+
+    def test_related_recipes_are_recorded(self):
+        fixture = mommy.fixture_scope(lambda: mommy.make_recipe('tests.generic.nullable_related'))
+        with transaction.atomic():
+            with fixture as parent:
+                assert parent.dummynullfieldsmodel_set.count() == 1
+            transaction.set_rollback(True)
+
+        with fixture as parent:
+            assert parent.dummynullfieldsmodel_set.count() == 1
+
+
+@pytest.fixture
+def sent_signals():
+    sent = []
+
+    def receiver(signal, sender, **kwargs):
+        sent.append((signal, sender))
+
+    for signal in (pre_save, post_save, m2m_changed):
+        signal.connect(receiver, dispatch_uid='sent_signals')
+    yield sent
+    for signal in (pre_save, post_save, m2m_changed):
+        signal.disconnect(dispatch_uid='sent_signals')
+
+
+@pytest.mark.django_db
+class TestMommyWithoutSignals():
+
+    def test_make_without_signals(self, sent_signals):
+        store = mommy.make(models.Store, make_m2m=True, _signals=False)
+        assert store.customers.count()
+        assert sent_signals == []
+
+        mommy.make(models.Dog)
+        assert (pre_save, models.Person) in sent_signals
+        assert (post_save, models.Dog) in sent_signals
+
+    def test_make_recipe_without_signals(self, sent_signals):
+        person = mommy.make_recipe('tests.generic.dog_lady', _signals=False)
+        assert person.dog_set.count() == 2
+        assert sent_signals == []
+
+    def test_signals_disabled_context(self, sent_signals):
+        with mommy.signals_disabled():
+            with mommy.signals_disabled():
+                mommy.make(models.Dog)
+            mommy.prepare(models.Person).save()
+        assert sent_signals == []
+        mommy.make(models.Person)
+        assert len(sent_signals) == 2
+
+    def test_other_threads_still_send_signals(self, sent_signals):
+        with mommy.signals_disabled():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(pre_save.send, sender=models.Person).result()
+        assert sent_signals == [(pre_save, models.Person)]
@@ -4,11 +4,11 @@ from random import choice
 from decimal import Decimal
 from unittest.mock import patch
 
-from datetime import timedelta
+from datetime import timedelta, timezone
 from model_mommy import mommy
-from model_mommy.recipe import Recipe, foreign_key, RecipeForeignKey
+from model_mommy.recipe import Recipe, foreign_key, related, RecipeForeignKey, seq
 from model_mommy.timezone import now, tz_aware
-from model_mommy.exceptions import InvalidQuantityException, RecipeIteratorEmpty
+from model_mommy.exceptions import InvalidQuantityException, RecipeIteratorEmpty, RecipeNotFound
 from tests.generic.models import TEST_TIME, Person, DummyNumbersModel, DummyBlankFieldsModel, Dog
 from tests.generic.mommy_recipes import SmallDogRecipe, pug
 
@@ -172,6 +172,25 @@ class TestDefiningRecipes():
             self.fail('%s' % e)
 
 
+class TestRecipePlan():
+
+    def test_attributes_are_sorted_once(self):
+        from tests.generic.mommy_recipes import dog, dog_with_friends, serial_person
+        assert dog.plan is dog.plan
+        assert dog.plan.static == {'breed': 'Pug'}
+        assert list(dog.plan.foreign_keys) == ['owner']
+        assert list(serial_person.plan.iterators) == ['name']
+        assert list(dog_with_friends.plan.related) == ['friends_with']
+
+    def test_extend_derives_plan_from_parent(self):
+        base = Recipe(Dog, breed=seq('dog'), owner=foreign_key(person_recipe))
+        extended = base.extend(breed='Pug')
+        assert extended.plan.static == {'breed': 'Pug'}
+        assert extended.plan.iterators == {}
+        assert extended.plan.foreign_keys == base.plan.foreign_keys
+        assert 'breed' in base.plan.iterators
+
+
 @pytest.mark.django_db
 class TestExecutingRecipes():
     """
@@ -321,6 +340,39 @@ class TestExecutingRecipes():
         assert person.name == 'Dennis Ritchie'
         assert person.age == 70
 
+    def test_recipe_lookups_are_cached(self):
+        from tests.generic import mommy_recipes
+        mommy.make_recipe('tests.generic.person')
+        with patch('model_mommy.mommy.importlib.import_module') as import_module:
+            person = mommy.prepare_recipe('tests.generic.person')
+        assert not import_module.called
+        assert mommy._recipes['tests.generic.person'] is mommy_recipes.person
+        assert person.name == 'John Doe'
+
+    def test_unknown_recipe_suggests_similar_names(self):
+        with pytest.raises(RecipeNotFound) as exc:
+            mommy.make_recipe('tests.generic.dgo')
+        assert "Did you mean 'tests.generic.dog'" in str(exc.value)
+
+    def test_unknown_recipes_module(self):
+        with pytest.raises(RecipeNotFound):
+            mommy.make_recipe('tests.undefined.dog')
+
+    def test_missing_import_inside_recipes_module(self):
+        error = ImportError("No module named 'zap'", name='zap')
+        with patch('model_mommy.mommy.importlib.import_module', side_effect=error):
+            with pytest.raises(ImportError) as exc:
+                mommy.make_recipe('zapp.thing')
+        assert not isinstance(exc.value, RecipeNotFound)
+
+    def test_autodiscover_recipes(self, monkeypatch):
+        from tests.generic import mommy_recipes
+        monkeypatch.setattr(mommy, '_recipes', {})
+        mommy.autodiscover_recipes()
+        assert mommy._recipes['tests.generic.dog'] is mommy_recipes.dog
+        assert mommy._recipes['tests.generic.pug'] is mommy_recipes.pug
+        assert 'tests.generic.TEST_TIME' not in mommy._recipes
+
     def test_import_recipe_inside_deeper_modules(self):
         recipe_name = 'tests.generic.tests.sub_package.person'
         person = mommy.prepare_recipe(recipe_name)
@@ -407,6 +459,42 @@ class TestForeignKey():
         movie = mommy.make_recipe('tests.generic.movie_with_cast')
         assert movie.cast_members.count() == 2
 
+    def test_related_with_count_uses_one_bulk_insert(self, django_assert_num_queries):
+        from tests.generic.mommy_recipes import cast_member
+        movie_recipe = Recipe('generic.Movie', cast_members=related(cast_member, count=50))
+
+        # movie, the person of the cast members and the cast members
+        with django_assert_num_queries(3):
+            movie = movie_recipe.make()
+        assert movie.cast_members.count() == 50
+
+    def test_related_with_count_and_quantity(self):
+        movie_recipe = Recipe(
+            'generic.Movie',
+            cast_members=related(Recipe('generic.CastMember'), count=3)
+        )
+        movies = movie_recipe.make(_quantity=2)
+        assert [m.cast_members.count() for m in movies] == [3, 3]
+
+    def test_empty_related_override(self):
+        lady = mommy.make_recipe('tests.generic.dog_lady', dog_set=[])
+        assert lady.dog_set.count() == 0
+        assert not Dog.objects.exists()
+
+    def test_related_with_m2m_values_is_made(self):
+        dog = mommy.make('generic.Dog')
+        person_recipe = Recipe(
+            'generic.Person', home_set=related(Recipe('generic.Home', dogs=[dog]), count=2)
+        )
+        person = person_recipe.make()
+        homes = person.home_set.all()
+        assert len(homes) == 2
+        assert all(list(home.dogs.all()) == [dog] for home in homes)
+
+    def test_related_count_must_be_valid(self):
+        with pytest.raises(InvalidQuantityException):
+            related(Recipe('generic.CastMember'), count=0)
+
 
 @pytest.mark.django_db
 class TestM2MField():
@@ -508,6 +596,35 @@ class TestSequences():
         assert dummies[1].default_date_field == TEST_TIME.date() + timedelta(days=2)
         assert dummies[2].default_date_field == TEST_TIME.date() + timedelta(days=3)
 
+    def test_take_returns_next_values(self):
+        sequence = seq('joe')
+        assert next(sequence) == 'joe1'
+        assert sequence.take(3) == ['joe2', 'joe3', 'joe4']
+        assert next(sequence) == 'joe5'
+
+    def test_take_numbers_and_dates(self):
+        assert seq(10).take(3) == [11, 12, 13]
+        assert seq(10, increment_by=1.5).take(2) == [11, 13]
+        assert seq(Decimal('1.5'), increment_by=Decimal('0.5')).take(2) == [
+            Decimal('2'), Decimal('2.5'),
+        ]
+        assert seq(TEST_TIME.date(), timedelta(days=1)).take(2) == [
+            TEST_TIME.date() + timedelta(days=1),
+            TEST_TIME.date() + timedelta(days=2),
+        ]
+        assert seq(TEST_TIME, timedelta(hours=1)).take(2) == [
+            tz_aware(TEST_TIME + timedelta(hours=1)),
+            tz_aware(TEST_TIME + timedelta(hours=2)),
+        ]
+
+    def test_take_with_aware_datetime(self):
+        start = TEST_TIME.replace(tzinfo=timezone.utc)
+        assert seq(start, timedelta(hours=1)).take(1) == [start + timedelta(hours=1)]
+
+    def test_template_copies_use_the_sequence(self):
+        template = Recipe(Person, name=seq('joe')).template()
+        assert [p.name for p in template.copies(3)] == ['joe1', 'joe2', 'joe3']
+
     def test_increment_after_override_definition_field(self):
         person = mommy.make_recipe('tests.generic.serial_person', name='tom')
         assert person.name == 'tom'